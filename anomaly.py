@@ -0,0 +1,63 @@
+"""
+Rolling median/MAD anomaly detection over pre-aggregated time buckets
+"""
+
+import numpy as np
+import pandas as pd
+from rollups import cached_rollup, minute_rollup
+
+
+# Scales MAD to be comparable with a standard deviation under normality
+MAD_SCALE = 0.6745
+
+
+def robust_scores(values: pd.Series, window: int = 30, min_periods: int = 10,
+                  counts: bool = False) -> pd.Series:
+    """Robust z-score of each bucket against the trailing window before it.
+
+    The baseline is the rolling median of the previous `window` buckets and the
+    spread is the rolling median of their absolute deviations, so the current
+    bucket never contributes to its own baseline. Runs in O(buckets).
+
+    With `counts`, the spread is never taken below the Poisson noise of the
+    baseline, so sparse traffic (median 0) does not flag every request.
+    """
+    history = values.shift(1)
+    median = history.rolling(window, min_periods=min_periods).median()
+    abs_dev = (values - median).abs()
+    mad = abs_dev.shift(1).rolling(window, min_periods=min_periods).median()
+
+    # Flat baselines (MAD of 0) would flag any change; floor the spread at 1% of the median
+    floor = (median.abs() * 0.01).clip(lower=1e-9)
+    if counts:
+        # Poisson std is sqrt(mean); expressed as a MAD so the score is in std units
+        floor = np.maximum(floor, MAD_SCALE * np.sqrt(median.clip(lower=1)))
+    mad = mad.where(mad > floor, floor)
+
+    return MAD_SCALE * (values - median) / mad
+
+
+def flag_scores(scores: pd.Series, threshold: float = 3.5, direction: str = 'up') -> pd.Series:
+    """Boolean mask of buckets whose robust score crosses `threshold`."""
+    if direction == 'up':
+        return (scores > threshold).fillna(False)
+    return (scores.abs() > threshold).fillna(False)
+
+
+def detect_anomalies(values: pd.Series, threshold: float = 3.5, window: int = 30,
+                     direction: str = 'up', counts: bool = False) -> pd.Series:
+    """Boolean mask of anomalous buckets.
+
+    `direction` is 'up' for latency regressions (only increases are flagged)
+    or 'both' for metrics like request counts where drops matter too.
+    """
+    return flag_scores(robust_scores(values, window=window, counts=counts), threshold, direction)
+
+
+def minute_scores(df: pd.DataFrame, column: str) -> pd.Series:
+    """Robust scores of a minute_rollup column over the whole dataset, cached per dataset.
+
+    Scoring the full series keeps each minute's baseline independent of the
+    time filter; pages slice the scores afterwards.
+    """
+    return cached_rollup(df, f'anomaly_scores_{column}', lambda d: robust_scores(minute_rollup(d)[column]))
@@ -4,7 +4,10 @@ Access Log Performance Metrics Dashboard - Home Page
 
 import streamlit as st
 import os
-from utils import parse_access_log
+import time
+
+# Parsing and analysis modules pull in pandas/numpy, so they are imported on
+# first use below; the landing page renders without them.
 
 st.set_page_config(
     page_title='Access Log Metrics Dashboard',
@@ -47,21 +50,103 @@ with st.sidebar:
         if os.path.exists(sample_file_path):
             with open(sample_file_path, 'r', encoding='utf-8') as f:
                 sample_content = f.read()
-            df_sample = parse_access_log(sample_content)
+            from dataset_registry import load_shared_log
+            df_sample = load_shared_log(sample_content)
             st.session_state['log_data'] = df_sample
             st.rerun()
 
+
+def show_overview(overview: dict):
+    """Render the four overview metric cards."""
+    col1, col2, col3, col4 = st.columns(4)
+
+    with col1:
+        st.metric('총 요청 수', f'{overview["total"]:,}')
+
+    with col2:
+        if overview['hours'] is not None:
+            st.metric('분석 기간', f'{overview["hours"]:.1f} 시간')
+        else:
+            st.metric('분석 기간', 'N/A')
+
+    with col3:
+        if overview['success_rate'] is not None:
+            st.metric('성공률 (200)', f'{overview["success_rate"]:.1f}%')
+        else:
+            st.metric('성공률', 'N/A')
+
+    with col4:
+        if overview['avg_rt'] is not None:
+            st.metric('평균 응답시간', f'{overview["avg_rt"]:.3f}s')
+        else:
+            st.metric('평균 응답시간', 'N/A')
+
+
+# Removing the upload stops its parse job so the worker releases the bytes
+if uploaded_file is None and st.session_state.get('parse_job') is not None:
+    st.session_state.pop('parse_job').cancel()
+    st.session_state.pop('parse_key', None)
+
 # Process and store log data in session state
 if uploaded_file is not None:
-    content = uploaded_file.read().decode('utf-8')
-    df = parse_access_log(content)
-    st.session_state['log_data'] = df
-    st.sidebar.success(f'✅ Loaded {len(df)} log entries')
+    # Uploaded files are parsed in a background job so the page stays responsive
+    upload_key = uploaded_file.file_id
+    job = st.session_state.get('parse_job')
+
+    if st.session_state.get('parse_key') != upload_key:
+        if job is not None:
+            job.cancel()
+        from ingest import ParseJob
+        job = ParseJob(uploaded_file.getvalue()).start()
+        st.session_state['parse_job'] = job
+        st.session_state['parse_key'] = upload_key
+
+    if job.done and not job.consumed:
+        job.consumed = True
+        if job.error is None and not job.cancelled:
+            st.session_state['log_data'] = job.result()
+
+    if job.done:
+        if job.error is not None:
+            st.sidebar.error(f'❌ Failed to parse log: {job.error}')
+        elif job.cancelled:
+            st.sidebar.warning(f'⏹ Parsing cancelled after {job.lines_read:,} lines')
+            if st.sidebar.button('🔄 Parse again', use_container_width=True):
+                del st.session_state['parse_key']
+                st.rerun()
+        else:
+            st.sidebar.success(f'✅ Loaded {len(st.session_state["log_data"])} log entries')
 elif log_text.strip():
-    df = parse_access_log(log_text)
+    from dataset_registry import load_shared_log
+    df = load_shared_log(log_text)
     st.session_state['log_data'] = df
     st.sidebar.success(f'✅ Parsed {len(df)} log entries')
 
+# Show ingest progress and a partial overview while a background parse is running
+job = st.session_state.get('parse_job')
+if uploaded_file is not None and job is not None and not job.done:
+    from utils import format_bytes, overview_metrics
+    progress = job.progress()
+
+    st.subheader('⏳ 로그 파싱 중...')
+    st.progress(
+        min(progress['fraction'], 1.0),
+        text=(
+            f'{format_bytes(progress["bytes_read"])} / {format_bytes(progress["total_bytes"])} '
+            f'| {progress["lines_read"]:,} lines | {progress["lines_per_sec"]:,.0f} lines/sec'
+        )
+    )
+
+    if st.button('⏹ Cancel', type='secondary'):
+        job.cancel()
+        st.rerun()
+
+    st.subheader('📊 데이터 개요 (부분 결과)')
+    show_overview(overview_metrics(job.overview()))
+
+    time.sleep(0.5)
+    st.rerun()
+
 # Display home page content
 if 'log_data' not in st.session_state or st.session_state['log_data'].empty:
     st.info('👆 왼쪽 사이드바에서 access.log 파일을 업로드하거나 로그 내용을 붙여넣으세요.')
@@ -115,32 +200,8 @@ else:
     # Display basic statistics
     st.subheader('📊 데이터 개요')
 
-    col1, col2, col3, col4 = st.columns(4)
-
-    with col1:
-        st.metric('총 요청 수', f'{len(df):,}')
-
-    with col2:
-        if 'timestamp' in df.columns and df['timestamp'].notna().any():
-            time_range = df['timestamp'].max() - df['timestamp'].min()
-            hours = time_range.total_seconds() / 3600
-            st.metric('분석 기간', f'{hours:.1f} 시간')
-        else:
-            st.metric('분석 기간', 'N/A')
-
-    with col3:
-        if 'status' in df.columns:
-            success_rate = (df['status'] == 200).sum() / len(df) * 100
-            st.metric('성공률 (200)', f'{success_rate:.1f}%')
-        else:
-            st.metric('성공률', 'N/A')
-
-    with col4:
-        if 'rt' in df.columns:
-            avg_rt = df['rt'].mean()
-            st.metric('평균 응답시간', f'{avg_rt:.3f}s')
-        else:
-            st.metric('평균 응답시간', 'N/A')
+    from utils import log_totals, overview_metrics
+    show_overview(overview_metrics(log_totals(df)))
 
     st.markdown('---')
 
@@ -0,0 +1,58 @@
+"""
+Bytes / throughput rollups: bandwidth per minute, method and route, and
+effective transfer-rate (bytes / rt) histograms
+"""
+
+import numpy as np
+import pandas as pd
+from rollups import cached_rollup, route_column
+
+
+# log10(bytes/sec) bin edges: 1 B/s .. 10 GB/s in 0.2 decade steps
+RATE_BIN_EDGES = np.linspace(0, 10, 51)
+RATE_BIN_CENTERS = 10 ** ((RATE_BIN_EDGES[:-1] + RATE_BIN_EDGES[1:]) / 2)
+
+INTERVAL_SECONDS = {'1min': 60, '5min': 300, '10min': 600, 'h': 3600}
+
+
+def _bandwidth_rollup(df: pd.DataFrame) -> pd.DataFrame:
+    keys = [df['timestamp'].dt.floor('min'), df['method'], route_column(df)]
+    grouped = df[['bytes', 'rt']].groupby(keys, observed=True)
+
+    out = grouped.sum()
+    out['count'] = grouped.size()
+    return out.reset_index()
+
+
+def bandwidth_rollup(df: pd.DataFrame) -> pd.DataFrame:
+    """Per (minute, method, route) byte total, rt total and request count."""
+    return cached_rollup(df, 'bandwidth', _bandwidth_rollup)
+
+
+def _transfer_rate_rollup(df: pd.DataFrame) -> pd.DataFrame:
+    valid = ((df['rt'] > 0) & (df['bytes'] > 0)).to_numpy()
+    rate = np.log10(df['bytes'].to_numpy()[valid] / df['rt'].to_numpy()[valid])
+    bins = np.clip(np.digitize(rate, RATE_BIN_EDGES) - 1, 0, len(RATE_BIN_CENTERS) - 1)
+
+    keys = pd.DataFrame({
+        'timestamp': df.loc[valid, 'timestamp'].dt.floor('min').to_numpy(),
+        'method': df.loc[valid, 'method'].to_numpy(),
+        'bin': bins,
+    })
+    return keys.groupby(['timestamp', 'method', 'bin']).size().rename('count').reset_index()
+
+
+def transfer_rate_rollup(df: pd.DataFrame) -> pd.DataFrame:
+    """Per (minute, method) histogram of log10(bytes / rt), one row per non-empty bin."""
+    return cached_rollup(df, 'transfer_rate', _transfer_rate_rollup)
+
+
+def histogram_quantile(hist: pd.DataFrame, q: float) -> pd.Series:
+    """Quantile of bytes/sec per row of a (group x bin) count matrix, at bin-center resolution."""
+    counts = hist.reindex(columns=range(len(RATE_BIN_CENTERS)), fill_value=0).to_numpy()
+    cumulative = counts.cumsum(axis=1)
+    totals = cumulative[:, -1:]
+
+    idx = (cumulative >= q * totals).argmax(axis=1)
+    values = np.where(totals[:, 0] > 0, RATE_BIN_CENTERS[idx], np.nan)
+    return pd.Series(values, index=hist.index)
@@ -0,0 +1,106 @@
+"""
+Startup and rerun latency benchmark for the dashboard pages
+
+Each page is run headless with Streamlit's AppTest in a fresh interpreter.
+Analysis pages need a parsed log in session state, and building it imports
+the app modules (and pandas/numpy) before the page runs, so those imports are
+timed separately and added back: cold = imports + first run. Parsing the log
+itself is reported as load and is not part of the cold time. Further reruns
+in the same process measure per-interaction latency.
+
+Usage:
+    python benchmarks/bench_startup.py [--log sample_access.log] [--reruns 5]
+"""
+
+import argparse
+import glob
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def page_scripts() -> list:
+    return [os.path.join(ROOT, 'app.py')] + sorted(glob.glob(os.path.join(ROOT, 'pages', '*.py')))
+
+
+def measure_page(script: str, log_path: str, reruns: int) -> dict:
+    """Run inside the child process: time the imports, the log load, the cold run and the reruns."""
+    sys.path.insert(0, ROOT)
+    started = time.perf_counter()
+
+    from streamlit.testing.v1 import AppTest
+
+    needs_log = log_path and os.path.basename(script) != 'app.py'
+    if needs_log:
+        import dataset_registry
+    imports = time.perf_counter() - started
+
+    at = AppTest.from_file(script, default_timeout=120)
+    started = time.perf_counter()
+    if needs_log:
+        with open(log_path, 'r', encoding='utf-8') as f:
+            at.session_state['log_data'] = dataset_registry.load_shared_log(f.read())
+    load = time.perf_counter() - started
+
+    started = time.perf_counter()
+    at.run()
+    first_run = time.perf_counter() - started
+
+    warm = []
+    for _ in range(reruns):
+        started = time.perf_counter()
+        at.run()
+        warm.append(time.perf_counter() - started)
+
+    return {
+        'imports_s': imports,
+        'load_s': load,
+        'cold_run_s': imports + first_run,
+        'rerun_median_s': statistics.median(warm) if warm else None,
+        'exceptions': len(at.exception),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--log', default=os.path.join(ROOT, 'sample_access.log'),
+                        help='access log loaded into session state for the analysis pages')
+    parser.add_argument('--reruns', type=int, default=5)
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(measure_page(args.child, args.log, args.reruns)))
+        return
+
+    print(f'{"page":<40} {"imports":>8} {"load":>8} {"cold":>8} {"rerun":>8}')
+    for script in page_scripts():
+        started = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '--child', script,
+             '--log', args.log, '--reruns', str(args.reruns)],
+            capture_output=True, text=True, cwd=ROOT,
+        )
+        total = time.perf_counter() - started
+        name = os.path.relpath(script, ROOT)
+
+        if result.returncode != 0:
+            print(f'{name:<40} failed:\n{result.stderr}')
+            continue
+
+        stats = json.loads(result.stdout.strip().splitlines()[-1])
+        rerun = f'{stats["rerun_median_s"]:.3f}s' if stats['rerun_median_s'] is not None else '-'
+        warning = f'  ({stats["exceptions"]} exception(s))' if stats['exceptions'] else ''
+        print(f'{name:<40} {stats["imports_s"]:>7.2f}s {stats["load_s"]:>7.2f}s '
+              f'{stats["cold_run_s"]:>7.2f}s {rerun:>8}{warning}')
+        print(f'{"":<40} process total {total:.2f}s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+"""
+Side-by-side comparison of two log datasets or time windows
+"""
+
+import math
+import numpy as np
+import pandas as pd
+from rollups import route_column
+
+
+LATENCY_METRICS = ['rt', 'uct', 'uht', 'urt']
+STATUS_CLASSES = ['2xx', '3xx', '4xx', '5xx']
+
+# Rank tests are run on a uniform sample of each side beyond this size
+SIGNIFICANCE_SAMPLE = 200_000
+
+
+def _sample(values: np.ndarray, size: int, seed: int) -> np.ndarray:
+    if len(values) <= size:
+        return values
+    rng = np.random.default_rng(seed)
+    return rng.choice(values, size=size, replace=False)
+
+
+def mann_whitney_pvalue(a: np.ndarray, b: np.ndarray, max_samples: int = SIGNIFICANCE_SAMPLE) -> float:
+    """Two-sided Mann-Whitney U p-value (normal approximation with tie correction)."""
+    a = _sample(a, max_samples, seed=0)
+    b = _sample(b, max_samples, seed=1)
+    n1, n2 = len(a), len(b)
+    if n1 < 2 or n2 < 2:
+        return float('nan')
+
+    combined = np.concatenate([a, b])
+    ranks = pd.Series(combined).rank(method='average').to_numpy()
+    u1 = ranks[:n1].sum() - n1 * (n1 + 1) / 2
+
+    n = n1 + n2
+    _, tie_counts = np.unique(combined, return_counts=True)
+    tie_term = ((tie_counts ** 3 - tie_counts).sum()) / (n * (n - 1))
+    sigma = math.sqrt(n1 * n2 / 12 * ((n + 1) - tie_term))
+    if sigma == 0:
+        return 1.0
+
+    z = (u1 - n1 * n2 / 2) / sigma
+    return math.erfc(abs(z) / math.sqrt(2))
+
+
+def compare_latency(a: pd.DataFrame, b: pd.DataFrame) -> pd.DataFrame:
+    """P50/P95/P99 per latency metric for both sides, with deltas and p-values."""
+    rows = []
+    for metric in LATENCY_METRICS:
+        if metric not in a.columns or metric not in b.columns:
+            continue
+
+        values_a = a[metric].dropna().to_numpy()
+        values_b = b[metric].dropna().to_numpy()
+        if len(values_a) == 0 or len(values_b) == 0:
+            continue
+
+        pct_a = np.percentile(values_a, [50, 95, 99])
+        pct_b = np.percentile(values_b, [50, 95, 99])
+        p_value = mann_whitney_pvalue(values_a, values_b)
+
+        for label, va, vb in zip(['P50', 'P95', 'P99'], pct_a, pct_b):
+            rows.append({
+                'metric': metric,
+                'percentile': label,
+                'A': va,
+                'B': vb,
+                'delta': vb - va,
+                'delta_pct': (vb - va) / va * 100 if va else np.nan,
+                'p_value': p_value,
+            })
+
+    return pd.DataFrame(rows)
+
+
+def request_rate(df: pd.DataFrame) -> float:
+    """Average requests per minute over the span of the data."""
+    if df.empty:
+        return 0.0
+    span = (df['timestamp'].max() - df['timestamp'].min()).total_seconds() / 60
+    return len(df) / max(span, 1.0)
+
+
+def status_mix(df: pd.DataFrame) -> pd.Series:
+    """Share of requests per status class (2xx..5xx), in percent."""
+    shares = (df['status'] // 100).value_counts(normalize=True) * 100
+    shares.index = [f'{c}xx' for c in shares.index]
+    return shares.reindex(STATUS_CLASSES, fill_value=0.0)
+
+
+def _route_stats(df: pd.DataFrame, routes: pd.Series) -> pd.DataFrame:
+    grouped = df['rt'].groupby(routes, observed=True)
+    stats = pd.DataFrame({
+        'count': grouped.size(),
+        'p50': grouped.quantile(0.5),
+        'p95': grouped.quantile(0.95),
+    })
+    # Plain string index so routes from differently-categorized datasets line up
+    stats.index = stats.index.astype(str)
+    return stats
+
+
+def compare_routes(a: pd.DataFrame, b: pd.DataFrame, routes_a: pd.Series, routes_b: pd.Series,
+                   min_count: int = 20) -> pd.DataFrame:
+    """Per-route rt P50/P95 on both sides, sorted by the largest P95 regression."""
+    stats = _route_stats(a, routes_a).join(
+        _route_stats(b, routes_b), how='inner', lsuffix='_a', rsuffix='_b'
+    )
+    stats = stats[(stats['count_a'] >= min_count) & (stats['count_b'] >= min_count)].copy()
+    stats['p95_delta'] = stats['p95_b'] - stats['p95_a']
+    stats['p95_delta_pct'] = stats['p95_delta'] / stats['p95_a'].where(stats['p95_a'] > 0) * 100
+
+    stats.index.name = 'route'
+    return stats.sort_values('p95_delta', ascending=False)
+
+
+def routes_for(df: pd.DataFrame, window: pd.DataFrame) -> pd.Series:
+    """Route templates for a window sliced from `df`, reusing the dataset's cached column."""
+    routes = route_column(df)
+    if window.empty:
+        return routes.iloc[:0]
+    return routes.loc[window.index[0]:window.index[-1]]
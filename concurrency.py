@@ -0,0 +1,100 @@
+"""
+In-flight request concurrency reconstructed from completion timestamps and rt
+"""
+
+import numpy as np
+import pandas as pd
+from rollups import cached_rollup
+
+
+NS = 1_000_000_000
+
+
+def _concurrency_rollup(df: pd.DataFrame) -> pd.DataFrame:
+    valid = (df['timestamp'].notna() & df['rt'].notna()).to_numpy()
+    if not valid.any():
+        return pd.DataFrame(
+            {'inflight_peak': [], 'inflight_mean': [], 'requests': [], 'rt_sum': []},
+            index=pd.DatetimeIndex([], name='timestamp'),
+        )
+
+    rt = np.clip(df['rt'].to_numpy(dtype=float)[valid], 0, None)
+
+    # The log line is written when the request completes, so timestamp is the
+    # end and timestamp - rt the start. Ends inherit the dataset's sort order.
+    ends = df['timestamp'].to_numpy().astype('datetime64[ns]').view('int64')[valid]
+    starts = np.sort(ends - (rt * NS).astype(np.int64))
+
+    first = starts[0] // NS
+    last = ends[-1] // NS
+    # Zero-delta events on every second boundary, so no constant-level segment spans two seconds
+    grid = np.arange(first, last + 2) * NS
+
+    times = np.concatenate([ends, grid, starts])
+    deltas = np.concatenate([
+        np.full(len(ends), -1, dtype=np.int8),
+        np.zeros(len(grid), dtype=np.int8),
+        np.ones(len(starts), dtype=np.int8),
+    ])
+
+    # Three already-sorted runs: the stable sort merges them in linear time and
+    # keeps ends before boundaries before starts at equal times ([start, end) intervals)
+    order = np.argsort(times, kind='stable')
+    times = times[order]
+    deltas = deltas[order]
+    level = np.cumsum(deltas, dtype=np.int32)
+
+    seconds = times // NS - first
+    n_seconds = len(grid)
+
+    # Time-weighted mean: each level holds until the next event
+    durations = np.diff(times, append=times[-1])
+    inflight_mean = np.bincount(seconds, weights=level * durations, minlength=n_seconds) / NS
+
+    # Levels only peak right after a start or at a boundary; the partial counts
+    # while a batch of ends is being applied never existed
+    peak_levels = np.where(deltas < 0, 0, level)
+    second_starts = np.concatenate([[0], np.flatnonzero(np.diff(seconds)) + 1])
+    inflight_peak = np.maximum.reduceat(peak_levels, second_starts)
+
+    end_seconds = ends // NS - first
+    return pd.DataFrame(
+        {
+            'inflight_peak': inflight_peak,
+            'inflight_mean': inflight_mean,
+            'requests': np.bincount(end_seconds, minlength=n_seconds),
+            'rt_sum': np.bincount(end_seconds, weights=rt, minlength=n_seconds),
+        },
+        index=pd.DatetimeIndex(grid.view('datetime64[ns]'), name='timestamp'),
+    )
+
+
+def concurrency_rollup(df: pd.DataFrame) -> pd.DataFrame:
+    """Per-second in-flight request count (peak and time-weighted mean) from a start/end sweep line.
+
+    Also carries the completions and their rt total per second for Little's law checks.
+    """
+    return cached_rollup(df, 'concurrency', _concurrency_rollup)
+
+
+def bucket_concurrency(per_second: pd.DataFrame, freq: str) -> pd.DataFrame:
+    """Roll the per-second series up to `freq` buckets and add the Little's law estimate.
+
+    Little's law gives L = arrival rate x mean rt = rt total / bucket length, which
+    should track the swept mean; requests spanning bucket edges account for the gap.
+    """
+    grouped = per_second.groupby(per_second.index.floor(freq))
+
+    buckets = grouped.agg(
+        inflight_peak=('inflight_peak', 'max'),
+        inflight_mean=('inflight_mean', 'mean'),
+        requests=('requests', 'sum'),
+        rt_sum=('rt_sum', 'sum'),
+        seconds=('requests', 'size'),
+    )
+    buckets['peak_at'] = grouped['inflight_peak'].idxmax()
+    buckets['arrival_rate'] = buckets['requests'] / buckets['seconds']
+    buckets['mean_rt'] = buckets['rt_sum'] / buckets['requests'].where(buckets['requests'] > 0)
+    buckets['littles_law'] = buckets['rt_sum'] / buckets['seconds']
+    buckets['littles_ratio'] = buckets['littles_law'] / buckets['inflight_mean'].where(buckets['inflight_mean'] > 0)
+    return buckets.drop(columns=['rt_sum', 'seconds'])
@@ -0,0 +1,51 @@
+"""
+Process-wide registry of parsed log datasets shared across browser sessions
+"""
+
+import hashlib
+import threading
+import weakref
+import pandas as pd
+from utils import parse_access_log
+
+
+# Content hash -> parsed DataFrame. Values are weak references: a dataset stays
+# alive only while some session still holds it in st.session_state, and is
+# evicted automatically once the last one lets go.
+_datasets = weakref.WeakValueDictionary()
+_lock = threading.Lock()
+
+
+def content_key(data: bytes) -> str:
+    """Stable content hash used to identify identical uploads."""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def get_dataset(key: str):
+    """Return the shared DataFrame for `key`, or None if nobody holds it anymore."""
+    with _lock:
+        return _datasets.get(key)
+
+
+def register_dataset(key: str, df: pd.DataFrame) -> pd.DataFrame:
+    """Publish `df` under `key` and return the canonical shared copy.
+
+    If another session registered the same content first, its DataFrame is
+    returned and `df` is dropped. Shared frames must be treated as read-only.
+    """
+    with _lock:
+        existing = _datasets.get(key)
+        if existing is not None:
+            return existing
+        _datasets[key] = df
+        return df
+
+
+def load_shared_log(content: str) -> pd.DataFrame:
+    """Parse `content` once per process and share the result."""
+    key = content_key(content.encode('utf-8'))
+    df = get_dataset(key)
+    if df is None:
+        df = register_dataset(key, parse_access_log(content))
+    return df
+
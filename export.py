@@ -0,0 +1,82 @@
+"""
+On-demand, chunked export of filtered log data (CSV, gzip CSV, Parquet)
+"""
+
+import gzip
+import io
+import streamlit as st
+import pandas as pd
+from datetime import datetime
+
+
+EXPORT_CHUNK_ROWS = 100_000
+
+EXPORT_FORMATS = {
+    'CSV': ('csv', 'text/csv'),
+    'CSV (gzip)': ('csv.gz', 'application/gzip'),
+    'Parquet': ('parquet', 'application/vnd.apache.parquet'),
+}
+
+
+def iter_chunks(df: pd.DataFrame, columns: list, chunk_rows: int = EXPORT_CHUNK_ROWS):
+    """Yield row slices of `df[columns]` without copying the whole frame up front."""
+    for start in range(0, max(len(df), 1), chunk_rows):
+        yield df.iloc[start:start + chunk_rows][columns]
+
+
+def _write_csv(df, columns, out, chunk_rows):
+    for idx, chunk in enumerate(iter_chunks(df, columns, chunk_rows)):
+        text = chunk.to_csv(index=False, header=(idx == 0), date_format='%Y-%m-%d %H:%M:%S')
+        out.write(text.encode('utf-8'))
+
+
+def _write_parquet(df, columns, out, chunk_rows):
+    # pyarrow ships with streamlit, so it is always available here
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    writer = None
+    for chunk in iter_chunks(df, columns, chunk_rows):
+        table = pa.Table.from_pandas(chunk, preserve_index=False)
+        if writer is None:
+            writer = pq.ParquetWriter(out, table.schema, compression='zstd')
+        writer.write_table(table)
+    writer.close()
+
+
+def write_export(df: pd.DataFrame, columns: list, fmt: str, chunk_rows: int = EXPORT_CHUNK_ROWS):
+    """Write `df[columns]` in chunks to an in-memory buffer in the given format.
+
+    st.download_button needs the finished bytes, so the file is not streamed;
+    writing straight into one buffer keeps peak memory near the output size.
+    """
+    out = io.BytesIO()
+
+    if fmt == 'Parquet':
+        _write_parquet(df, columns, out, chunk_rows)
+    elif fmt == 'CSV (gzip)':
+        with gzip.GzipFile(fileobj=out, mode='wb', compresslevel=6) as gz:
+            _write_csv(df, columns, gz, chunk_rows)
+    else:
+        _write_csv(df, columns, out, chunk_rows)
+
+    return out
+
+
+def export_controls(df: pd.DataFrame, columns: list, file_prefix: str, label: str, key: str):
+    """Format picker plus a prepare button; the file is only built when requested."""
+    fmt = st.selectbox('Format', list(EXPORT_FORMATS), key=f'{key}_format')
+
+    if st.button(f'⚙️ Prepare {label}', key=f'{key}_prepare'):
+        extension, mime = EXPORT_FORMATS[fmt]
+        with st.spinner(f'Writing {len(df):,} rows...'):
+            # getvalue() hands over the buffer without copying it
+            data = write_export(df, columns, fmt).getvalue()
+
+        st.download_button(
+            label=f'📋 Download {label}',
+            data=data,
+            file_name=f'{file_prefix}_{datetime.now().strftime("%Y%m%d_%H%M%S")}.{extension}',
+            mime=mime,
+            key=f'{key}_download',
+        )
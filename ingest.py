@@ -0,0 +1,147 @@
+"""
+Background access log ingestion with progress reporting
+"""
+
+import io
+import threading
+import time
+import pandas as pd
+from utils import parse_log_line, build_log_dataframe, concat_log_frames, log_totals, merge_log_totals
+from dataset_registry import content_key, get_dataset, register_dataset
+
+
+BATCH_LINES = 50_000
+
+
+class ParseJob:
+    """Parse an uploaded access log in a worker thread.
+
+    The Streamlit script thread polls `progress()` and `overview()` on each
+    rerun; the worker only touches plain Python state behind a lock, so it
+    never calls into Streamlit itself.
+    """
+
+    def __init__(self, data: bytes, batch_lines: int = BATCH_LINES):
+        self.total_bytes = len(data)
+        self._data = data
+        self._batch_lines = batch_lines
+
+        self._lock = threading.Lock()
+        self._cancel_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='log-parse-job', daemon=True)
+
+        self.bytes_read = 0
+        self.lines_read = 0
+        self.started_at = None
+        self.finished_at = None
+        self.error = None
+        self.consumed = False
+
+        self._frames = []
+        self._totals = log_totals(pd.DataFrame())
+        self._result = None
+
+    def start(self) -> 'ParseJob':
+        self.started_at = time.monotonic()
+        self._thread.start()
+        return self
+
+    def cancel(self):
+        self._cancel_event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+
+    @property
+    def done(self) -> bool:
+        return self.finished_at is not None
+
+    def progress(self) -> dict:
+        """Bytes processed, completion fraction and throughput so far."""
+        with self._lock:
+            bytes_read = self.bytes_read
+            lines_read = self.lines_read
+
+        end = self.finished_at or time.monotonic()
+        elapsed = max(end - (self.started_at or end), 1e-9)
+
+        return {
+            'bytes_read': bytes_read,
+            'total_bytes': self.total_bytes,
+            'fraction': bytes_read / self.total_bytes if self.total_bytes else 1.0,
+            'lines_read': lines_read,
+            'lines_per_sec': lines_read / elapsed,
+            'elapsed': elapsed,
+        }
+
+    def overview(self) -> dict:
+        """Running totals over the batches parsed so far."""
+        with self._lock:
+            return dict(self._totals)
+
+    def result(self) -> pd.DataFrame:
+        """Final DataFrame, sorted by timestamp. Only valid once `done`."""
+        return self._result
+
+    def _flush(self, records: list, bytes_read: int, lines_read: int):
+        batch = build_log_dataframe(records, sort=False)
+        with self._lock:
+            if not batch.empty:
+                self._frames.append(batch)
+                self._totals = merge_log_totals(self._totals, log_totals(batch))
+            self.bytes_read = bytes_read
+            self.lines_read = lines_read
+
+    def _run(self):
+        try:
+            # Reuse the dataset if another session already parsed this content
+            key = content_key(self._data)
+            shared = get_dataset(key)
+            if shared is not None:
+                with self._lock:
+                    self._totals = log_totals(shared)
+                    self.bytes_read = self.total_bytes
+                self._result = shared
+                return
+
+            records = []
+            bytes_read = 0
+            lines_read = 0
+
+            for raw in io.BytesIO(self._data):
+                if self._cancel_event.is_set():
+                    break
+
+                bytes_read += len(raw)
+                lines_read += 1
+
+                line = raw.decode('utf-8', errors='replace').strip()
+                if line:
+                    record = parse_log_line(line)
+                    if record is not None:
+                        records.append(record)
+
+                if lines_read % self._batch_lines == 0:
+                    self._flush(records, bytes_read, lines_read)
+                    records = []
+
+            self._flush(records, bytes_read, lines_read)
+
+            if not self.cancelled:
+                frames = self._frames
+                if frames:
+                    df = concat_log_frames(frames)
+                    if 'timestamp' in df.columns:
+                        df = df.sort_values('timestamp').reset_index(drop=True)
+                else:
+                    df = pd.DataFrame()
+                self._result = register_dataset(key, df)
+        except Exception as e:
+            self.error = e
+        finally:
+            # Cancelled or failed jobs stay in session_state; release their batches too
+            self._data = None
+            with self._lock:
+                self._frames = []
+            self.finished_at = time.monotonic()
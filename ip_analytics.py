@@ -0,0 +1,145 @@
+"""
+Client/remote IP traffic analytics over the compact integer address encoding
+"""
+
+import numpy as np
+import pandas as pd
+from utils import IPV4_MAPPED, format_ip
+from rollups import cached_rollup
+
+
+# 2^10 registers per bucket: ~3.2% standard error, 1 KB per bucket
+HLL_PRECISION = 10
+
+_LOW32 = np.uint64(0xFFFFFFFF)
+_ALL64 = np.uint64(0xFFFFFFFFFFFFFFFF)
+
+
+def ip_columns(df: pd.DataFrame, field: str) -> list:
+    """Encoded columns present for an IP field: `<field>_v4`, or `<field>_hi` and `<field>_lo`."""
+    return [f'{field}_{part}' for part in ['v4', 'hi', 'lo'] if f'{field}_{part}' in df.columns]
+
+
+def is_ipv4(hi: np.ndarray, lo: np.ndarray) -> np.ndarray:
+    return (hi == 0) & ((lo & ~_LOW32) == IPV4_MAPPED)
+
+
+def _address_codes(df: pd.DataFrame, field: str) -> tuple:
+    if f'{field}_v4' in df.columns:
+        # IPv4-only field: factorize the uint32 and map the uniques into the (hi, lo) space
+        codes, uniques = pd.factorize(df[f'{field}_v4'].to_numpy())
+        v4 = np.asarray(uniques, dtype=np.uint64)
+        lo = np.where(v4 > 0, IPV4_MAPPED | v4, np.uint64(0))
+        return codes, np.zeros(len(lo), dtype=np.uint64), lo
+
+    hi = df[f'{field}_hi'].to_numpy()
+    lo = df[f'{field}_lo'].to_numpy()
+
+    codes, uniques = pd.factorize(pd.MultiIndex.from_arrays([hi, lo]))
+    return (
+        codes,
+        uniques.get_level_values(0).to_numpy(dtype=np.uint64),
+        uniques.get_level_values(1).to_numpy(dtype=np.uint64),
+    )
+
+
+def address_codes(df: pd.DataFrame, field: str) -> tuple:
+    """Dense id per row's address plus the (hi, lo) of each id, cached per dataset."""
+    return cached_rollup(df, f'ip_codes_{field}', lambda d: _address_codes(d, field))
+
+
+def mask_prefix(hi: np.ndarray, lo: np.ndarray, v4_prefix: int, v6_prefix: int) -> tuple:
+    """Zero the host bits: IPv4 addresses to /v4_prefix, IPv6 addresses to /v6_prefix."""
+    v4 = is_ipv4(hi, lo)
+
+    v4_mask = ~np.uint64((1 << (32 - v4_prefix)) - 1)
+    if v6_prefix >= 64:
+        v6_hi_mask = _ALL64
+        v6_lo_mask = ~np.uint64((1 << (128 - v6_prefix)) - 1) if v6_prefix < 128 else _ALL64
+    else:
+        v6_hi_mask = ~np.uint64((1 << (64 - v6_prefix)) - 1)
+        v6_lo_mask = np.uint64(0)
+
+    masked_hi = np.where(v4, hi, hi & v6_hi_mask)
+    masked_lo = np.where(v4, lo & v4_mask, lo & v6_lo_mask)
+    return masked_hi, masked_lo
+
+
+def format_prefix(hi: int, lo: int, v4_prefix: int, v6_prefix: int) -> str:
+    """CIDR notation for a masked (hi, lo) prefix."""
+    is_v4 = int(hi) == 0 and int(lo) >> 32 == 0xFFFF
+    return f'{format_ip(hi, lo)}/{v4_prefix if is_v4 else v6_prefix}'
+
+
+def top_talkers(df: pd.DataFrame, codes: np.ndarray, top_n: int, minutes: float) -> pd.DataFrame:
+    """Request count, rate, latency and error share for the `top_n` busiest codes.
+
+    Counting is a bincount over all rows; the heavier per-group statistics are
+    only computed for rows belonging to the winners.
+    """
+    counts = np.bincount(codes[codes >= 0])
+    if len(counts) == 0:
+        return pd.DataFrame()
+
+    top_n = min(top_n, len(counts))
+    top = np.argpartition(-counts, top_n - 1)[:top_n]
+    top = top[np.argsort(-counts[top], kind='stable')]
+
+    rows = np.isin(codes, top)
+    subset = df.loc[rows, ['rt', 'bytes', 'status']]
+    grouped = subset.groupby(codes[rows])
+
+    stats = pd.DataFrame({
+        'requests': grouped.size(),
+        'rt_mean': grouped['rt'].mean(),
+        'rt_p95': grouped['rt'].quantile(0.95),
+        'bytes': grouped['bytes'].sum(),
+        'error_%': (subset['status'] >= 400).groupby(codes[rows]).mean() * 100,
+    }).reindex(top)
+    stats.insert(1, 'req_per_min', stats['requests'] / max(minutes, 1.0))
+    return stats
+
+
+def _splitmix64(x: np.ndarray) -> np.ndarray:
+    # uint64 arithmetic wraps; that is the intended behaviour for hashing
+    with np.errstate(over='ignore'):
+        z = x + np.uint64(0x9E3779B97F4A7C15)
+        z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        return z ^ (z >> np.uint64(31))
+
+
+def _bit_length(v: np.ndarray) -> np.ndarray:
+    # frexp is exact on 32-bit halves, so split the uint64 before converting to float
+    high = np.frexp((v >> np.uint64(32)).astype(np.float64))[1]
+    low = np.frexp((v & _LOW32).astype(np.float64))[1]
+    return np.where(high > 0, high + 32, low)
+
+
+def hll_registers(bucket_codes: np.ndarray, n_buckets: int, hi: np.ndarray, lo: np.ndarray,
+                  precision: int = HLL_PRECISION) -> np.ndarray:
+    """HyperLogLog registers, one row of 2^precision per bucket."""
+    m = 1 << precision
+    hashed = _splitmix64(_splitmix64(hi) ^ lo)
+
+    index = (hashed >> np.uint64(64 - precision)).astype(np.int64)
+    rest = hashed & np.uint64((1 << (64 - precision)) - 1)
+    rank = (64 - precision) - _bit_length(rest) + 1
+
+    keys = bucket_codes.astype(np.int64) * m + index
+    best = pd.Series(rank).groupby(keys).max()
+
+    registers = np.zeros(n_buckets * m, dtype=np.uint8)
+    registers[best.index.to_numpy()] = best.to_numpy()
+    return registers.reshape(n_buckets, m)
+
+
+def hll_estimate(registers: np.ndarray) -> np.ndarray:
+    """Cardinality estimate per register row (with linear counting for small sets)."""
+    m = registers.shape[-1]
+    alpha = 0.7213 / (1 + 1.079 / m)
+    raw = alpha * m * m / np.sum(np.power(2.0, -registers.astype(np.float64)), axis=-1)
+
+    zeros = np.sum(registers == 0, axis=-1)
+    linear = m * np.log(m / np.maximum(zeros, 1))
+    return np.where((raw <= 2.5 * m) & (zeros > 0), linear, raw)
@@ -4,9 +4,12 @@ Response Time Analysis Page
 
 import streamlit as st
 import pandas as pd
-import plotly.graph_objects as go
-import plotly.express as px
 from datetime import datetime
+from ui import lazy_section
+from export import export_controls
+from rollups import minute_rollup, slice_buckets, window_slice, breakdown_rollup, BREAKDOWN_COMPONENTS
+from anomaly import minute_scores, flag_scores
+from pagination import SORT_OPTIONS, page_positions
 
 st.set_page_config(
     page_title='요청 응답 시간 분석',
@@ -22,7 +25,8 @@ if 'log_data' not in st.session_state or st.session_state['log_data'].empty:
     st.warning('⚠️ 데이터가 로드되지 않았습니다. 홈페이지에서 로그 파일을 업로드해주세요.')
     st.stop()
 
-df = st.session_state['log_data'].copy()
+# Shared across sessions via dataset_registry; treat as read-only
+df = st.session_state['log_data']
 
 st.markdown('---')
 
@@ -45,13 +49,12 @@ with st.sidebar:
         start_datetime = datetime.combine(start_date, start_time)
         end_datetime = datetime.combine(end_date, end_time)
 
-        # Filter dataframe
-        mask = (df['timestamp'] >= start_datetime) & (df['timestamp'] <= end_datetime)
-        df_filtered = df[mask].copy()
+        # Binary-search slice of the shared frame: no mask, no copy
+        df_filtered = window_slice(df, start_datetime, end_datetime)
 
         st.info(f'Showing {len(df_filtered)} of {len(df)} entries')
     else:
-        df_filtered = df.copy()
+        df_filtered = df
         st.warning('No valid timestamps found')
 
     st.markdown('---')
@@ -64,6 +67,19 @@ with st.sidebar:
         default=metrics_options,
     )
 
+    st.markdown('---')
+    st.header('🚨 Anomaly Detection')
+
+    show_anomalies = st.checkbox('Highlight latency anomalies', value=True)
+    anomaly_threshold = st.slider(
+        'Sensitivity (robust z-score)',
+        min_value=2.0,
+        max_value=8.0,
+        value=3.5,
+        step=0.5,
+        help='Per-minute P95 is compared with the rolling median/MAD of the previous 30 minutes',
+    )
+
 if df_filtered.empty:
     st.warning('No data matches the selected time range.')
     st.stop()
@@ -98,6 +114,9 @@ st.markdown('---')
 st.header('📈 Performance Metrics Over Time')
 
 if selected_metrics:
+    # plotly is imported where it is first needed so collapsed sections never load it
+    import plotly.graph_objects as go
+
     fig = go.Figure()
 
     colors = {
@@ -131,6 +150,39 @@ if selected_metrics:
                 )
             ))
 
+    # Mark minutes whose P95 jumps above the rolling baseline
+    anomaly_count = 0
+    if show_anomalies and df_filtered['timestamp'].notna().any():
+        window_start = df_filtered['timestamp'].min().floor('min')
+        window_end = df_filtered['timestamp'].max()
+        rollup = slice_buckets(minute_rollup(df), window_start, window_end)
+
+        for metric in selected_metrics:
+            column = f'{metric}_p95'
+            if column not in rollup.columns:
+                continue
+
+            # Scored over the whole dataset, so baselines do not restart at the filter start
+            scores = slice_buckets(minute_scores(df, column), window_start, window_end)
+            flagged = rollup[flag_scores(scores, threshold=anomaly_threshold).to_numpy()]
+            anomaly_count += len(flagged)
+            if flagged.empty:
+                continue
+
+            fig.add_trace(go.Scatter(
+                x=flagged.index,
+                y=flagged[column],
+                mode='markers',
+                name=f'Anomaly ({metric} P95)',
+                marker=dict(color=colors.get(metric, '#333'), size=14, symbol='x-open', line=dict(width=2)),
+                hovertemplate=(
+                    f'<b>Anomaly: {metric} P95</b><br>'
+                    'Minute: %{x}<br>'
+                    'P95: %{y:.3f}s<br>'
+                    '<extra></extra>'
+                )
+            ))
+
     fig.update_layout(
         title='Performance Metrics Timeline',
         xaxis_title='Timestamp',
@@ -147,38 +199,148 @@ if selected_metrics:
     )
 
     st.plotly_chart(fig, use_container_width=True)
+
+    if show_anomalies:
+        st.caption(f'🚨 {anomaly_count} anomalous minute(s) flagged')
 else:
     st.info('Select at least one metric from the sidebar')
 
 # Distribution charts
-st.header('📊 Metric Distributions')
+if lazy_section('📊 Metric Distributions', key='rt_distributions'):
+    import plotly.express as px
+
+    cols = st.columns(2)
+    for idx, metric in enumerate(selected_metrics[:4]):
+        with cols[idx % 2]:
+            if metric in df_filtered.columns:
+                metric_labels = {
+                    'rt': 'Response Time (rt)',
+                    'uct': 'Upstream Connect Time (uct)',
+                    'uht': 'Upstream Header Time (uht)',
+                    'urt': 'Upstream Response Time (urt)',
+                }
+
+                fig_dist = px.histogram(
+                    df_filtered,
+                    x=metric,
+                    nbins=50,
+                    title=f'{metric_labels.get(metric, metric)} Distribution',
+                    labels={metric: 'Time (seconds)'},
+                )
 
-cols = st.columns(2)
-for idx, metric in enumerate(selected_metrics[:4]):
-    with cols[idx % 2]:
-        if metric in df_filtered.columns:
-            metric_labels = {
-                'rt': 'Response Time (rt)',
-                'uct': 'Upstream Connect Time (uct)',
-                'uht': 'Upstream Header Time (uht)',
-                'urt': 'Upstream Response Time (urt)',
-            }
-
-            fig_dist = px.histogram(
-                df_filtered,
-                x=metric,
-                nbins=50,
-                title=f'{metric_labels.get(metric, metric)} Distribution',
-                labels={metric: 'Time (seconds)'},
-            )
-
-            fig_dist.update_layout(
-                xaxis_title='Time (seconds)',
-                yaxis_title='Count',
-                height=400,
-            )
-
-            st.plotly_chart(fig_dist, use_container_width=True)
+                fig_dist.update_layout(
+                    xaxis_title='Time (seconds)',
+                    yaxis_title='Count',
+                    height=400,
+                )
+
+                st.plotly_chart(fig_dist, use_container_width=True)
+
+# Latency breakdown
+st.markdown('---')
+if lazy_section('🧩 Latency Breakdown', key='rt_breakdown'):
+    import plotly.graph_objects as go
+
+    st.markdown('rt = 연결(uct) + 헤더 대기(uht − uct) + 본문 전송(urt − uht) + nginx 오버헤드(rt − urt)')
+
+    breakdown = breakdown_rollup(df)
+    breakdown = breakdown[
+        (breakdown['timestamp'] >= df_filtered['timestamp'].min().floor('min'))
+        & (breakdown['timestamp'] <= df_filtered['timestamp'].max())
+    ]
+
+    component_labels = {
+        'uct': 'Connect (uct)',
+        'upstream_header': 'Header wait (uht − uct)',
+        'upstream_body': 'Body (urt − uht)',
+        'nginx_overhead': 'Nginx overhead (rt − urt)',
+    }
+    component_colors = {
+        'uct': '#ff7f0e',
+        'upstream_header': '#2ca02c',
+        'upstream_body': '#d62728',
+        'nginx_overhead': '#9467bd',
+    }
+
+    if breakdown.empty:
+        st.info('No requests with complete rt/uct/uht/urt values in the selected range')
+    else:
+        top_routes_n = st.slider('Number of top routes (by total time)', min_value=5, max_value=30, value=10, step=5)
+
+        per_route = breakdown.groupby('route', observed=True)[BREAKDOWN_COMPONENTS + ['count', 'urt']].sum()
+        per_route['total'] = per_route[BREAKDOWN_COMPONENTS].sum(axis=1)
+        per_route = per_route.sort_values('total', ascending=False).head(top_routes_n)
+
+        fig_breakdown = go.Figure()
+        for component in BREAKDOWN_COMPONENTS:
+            fig_breakdown.add_trace(go.Bar(
+                y=per_route.index.astype(str),
+                x=per_route[component] / per_route['count'],
+                name=component_labels[component],
+                orientation='h',
+                marker_color=component_colors[component],
+                hovertemplate=(
+                    f'<b>{component_labels[component]}</b><br>'
+                    'Route: %{y}<br>'
+                    'Mean: %{x:.3f}s<br>'
+                    '<extra></extra>'
+                )
+            ))
+
+        fig_breakdown.update_layout(
+            title=f'Mean rt Breakdown - Top {top_routes_n} Routes by Total Time',
+            xaxis_title='Mean time per request (seconds)',
+            yaxis={'categoryorder': 'total ascending'},
+            barmode='stack',
+            height=max(400, top_routes_n * 35),
+        )
+
+        st.plotly_chart(fig_breakdown, use_container_width=True)
+
+        # Share of each component in the route's total time
+        contributors = pd.DataFrame({'requests': per_route['count']})
+        contributors['total_time_s'] = per_route['total']
+        contributors['mean_rt_s'] = per_route['total'] / per_route['count']
+        for component in BREAKDOWN_COMPONENTS:
+            contributors[f'{component}_%'] = per_route[component] / per_route['total'] * 100
+        contributors['connect_share'] = per_route['uct'] / per_route['urt'].where(per_route['urt'] > 0)
+        contributors.index = contributors.index.astype(str)
+
+        st.dataframe(
+            contributors,
+            use_container_width=True,
+            height=400
+        )
+
+        # Breakdown over time
+        per_minute = breakdown.groupby('timestamp')[BREAKDOWN_COMPONENTS + ['count']].sum()
+
+        fig_breakdown_time = go.Figure()
+        for component in BREAKDOWN_COMPONENTS:
+            fig_breakdown_time.add_trace(go.Scatter(
+                x=per_minute.index,
+                y=per_minute[component] / per_minute['count'],
+                name=component_labels[component],
+                mode='lines',
+                stackgroup='breakdown',
+                line=dict(color=component_colors[component]),
+                hovertemplate=(
+                    f'<b>{component_labels[component]}</b><br>'
+                    'Minute: %{x}<br>'
+                    'Mean: %{y:.3f}s<br>'
+                    '<extra></extra>'
+                )
+            ))
+
+        fig_breakdown_time.update_layout(
+            title='Mean rt Breakdown Over Time (per minute)',
+            xaxis_title='Timestamp',
+            yaxis_title='Time (seconds)',
+            hovermode='x unified',
+            height=450,
+        )
+
+        st.plotly_chart(fig_breakdown_time, use_container_width=True)
 
 # Request details table
 st.markdown('---')
@@ -195,7 +357,7 @@ with search_col2:
         default=None
     )
 
-display_df = df_filtered.copy()
+display_df = df_filtered
 
 if search_query:
     display_df = display_df[display_df['path'].str.contains(search_query, case=False, na=False)]
@@ -203,17 +365,48 @@ if search_query:
 if status_filter:
     display_df = display_df[display_df['status'].isin(status_filter)]
 
-# Show data table
+# Show data table (only the visible page is fetched and sent to the browser)
 display_columns = ['timestamp', 'method', 'path', 'status', 'bytes', 'rt', 'uct', 'uht', 'urt']
 available_display_columns = [col for col in display_columns if col in display_df.columns]
 
+sort_col, size_col, page_col = st.columns([2, 1, 1])
+with sort_col:
+    sort_label = st.selectbox('Sort by', list(SORT_OPTIONS))
+with size_col:
+    page_size = st.selectbox('Rows per page', [25, 50, 100, 200], index=2)
+
+total_rows = len(display_df)
+page_count = max(1, -(-total_rows // page_size))
+
+# Clamp the page when filters shrink the result set
+if st.session_state.get('rt_details_page', 1) > page_count:
+    st.session_state['rt_details_page'] = page_count
+
+with page_col:
+    page = st.number_input('Page', min_value=1, max_value=page_count, value=1, step=1, key='rt_details_page')
+
+start = (page - 1) * page_size
+stop = min(start + page_size, total_rows)
+
+sort_column, sort_descending = SORT_OPTIONS[sort_label]
+# The shared dataset keeps a RangeIndex, so index labels are row positions
+positions = page_positions(
+    df,
+    display_df.index.to_numpy(),
+    sort_column,
+    sort_descending,
+    start,
+    stop,
+)
+
 st.dataframe(
-    display_df[available_display_columns].head(100),
+    df.iloc[positions][available_display_columns],
     use_container_width=True,
     height=400
 )
 
-st.caption(f'Showing {min(100, len(display_df))} of {len(display_df)} filtered entries')
+st.caption(f'Showing {start + 1 if total_rows else 0:,}–{stop:,} of {total_rows:,} filtered entries '
+           f'(page {page:,} of {page_count:,})')
 
 # Export report section
 st.markdown('---')
@@ -252,19 +445,13 @@ with col1:
         )
 
 with col2:
-    # Export detailed data
-    export_df = display_df[available_display_columns].copy()
-
-    # Convert timestamp to string for CSV export
-    if 'timestamp' in export_df.columns:
-        export_df['timestamp'] = export_df['timestamp'].dt.strftime('%Y-%m-%d %H:%M:%S')
-
-    csv_detail = export_df.to_csv(index=False)
-    st.download_button(
-        label='📋 Download Detailed Data',
-        data=csv_detail,
-        file_name=f'response_time_detail_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv',
-        mime='text/csv',
+    # Export detailed data (built in chunks only when requested)
+    export_controls(
+        display_df,
+        available_display_columns,
+        file_prefix='response_time_detail',
+        label='Detailed Data',
+        key='rt_detail_export',
     )
 
-st.info(f'💡 Summary: {len(summary_df)} metrics | Detail: {len(export_df)} entries')
+st.info(f'💡 Summary: {len(summary_df)} metrics | Detail: {len(display_df)} entries')
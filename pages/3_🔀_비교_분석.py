@@ -0,0 +1,241 @@
+"""
+Comparison Page - two datasets or two time windows side by side
+"""
+
+import time
+import streamlit as st
+import pandas as pd
+import plotly.graph_objects as go
+from datetime import timedelta
+from rollups import window_slice
+from compare import compare_latency, request_rate, status_mix, compare_routes, routes_for
+from ui import lazy_section
+
+st.set_page_config(
+    page_title='비교 분석',
+    page_icon='🔀',
+    layout='wide'
+)
+
+st.title('🔀 비교 분석')
+st.markdown('두 데이터셋 또는 두 시간 구간의 성능 지표를 나란히 비교합니다. (배포 전/후 비교 등)')
+
+# Check if data exists
+if 'log_data' not in st.session_state or st.session_state['log_data'].empty:
+    st.warning('⚠️ 데이터가 로드되지 않았습니다. 홈페이지에서 로그 파일을 업로드해주세요.')
+    st.stop()
+
+# Shared across sessions via dataset_registry; treat as read-only
+df = st.session_state['log_data']
+
+if 'timestamp' not in df.columns or df['timestamp'].isna().all():
+    st.error('❌ 타임스탬프 데이터가 없습니다.')
+    st.stop()
+
+st.markdown('---')
+
+with st.sidebar:
+    st.header('🔀 Comparison Mode')
+
+    mode = st.radio(
+        'Compare',
+        ['Two time windows', 'Two datasets'],
+        help='Windows of the loaded log, or the loaded log (A) against another file (B)',
+    )
+
+    if mode == 'Two time windows':
+        min_time = df['timestamp'].min().to_pydatetime()
+        max_time = df['timestamp'].max().to_pydatetime()
+        if min_time == max_time:
+            st.info('The loaded log covers a single timestamp; switch to "Two datasets" to compare it')
+            st.stop()
+
+        mid_time = min_time + (max_time - min_time) / 2
+
+        window_a = st.slider(
+            'Window A (before)',
+            min_value=min_time,
+            max_value=max_time,
+            value=(min_time, mid_time),
+            step=timedelta(minutes=1),
+            format='MM/DD HH:mm',
+        )
+        window_b = st.slider(
+            'Window B (after)',
+            min_value=min_time,
+            max_value=max_time,
+            value=(mid_time, max_time),
+            step=timedelta(minutes=1),
+            format='MM/DD HH:mm',
+        )
+
+        df_a = window_slice(df, *window_a)
+        df_b = window_slice(df, *window_b)
+        source_a, source_b = df, df
+    else:
+        compare_file = st.file_uploader(
+            'Upload dataset B',
+            type=['log', 'txt'],
+            help='The log currently loaded on the home page is dataset A',
+            key='compare_uploader'
+        )
+
+        if compare_file is not None:
+            # Parsed in the same background job as home page uploads
+            job = st.session_state.get('compare_job')
+            if st.session_state.get('compare_key') != compare_file.file_id:
+                if job is not None:
+                    job.cancel()
+                from ingest import ParseJob
+                job = ParseJob(compare_file.getvalue()).start()
+                st.session_state.pop('compare_data', None)
+                st.session_state['compare_job'] = job
+                st.session_state['compare_key'] = compare_file.file_id
+
+            if not job.done:
+                progress = job.progress()
+                st.progress(
+                    min(progress['fraction'], 1.0),
+                    text=f'Parsing dataset B | {progress["lines_read"]:,} lines'
+                )
+                time.sleep(0.5)
+                st.rerun()
+
+            if not job.consumed:
+                job.consumed = True
+                if job.error is None:
+                    st.session_state['compare_data'] = job.result()
+
+            if job.error is not None:
+                st.error(f'❌ Failed to parse dataset B: {job.error}')
+        elif st.session_state.get('compare_job') is not None:
+            # Removing the upload drops dataset B along with its job
+            st.session_state.pop('compare_job').cancel()
+            st.session_state.pop('compare_key', None)
+            st.session_state.pop('compare_data', None)
+
+        df_b_full = st.session_state.get('compare_data')
+        if df_b_full is None or df_b_full.empty:
+            st.info('Upload a second log file to compare against')
+            st.stop()
+
+        df_a, df_b = df, df_b_full
+        source_a, source_b = df, df_b_full
+
+    st.info(f'A: {len(df_a):,} entries | B: {len(df_b):,} entries')
+
+if df_a.empty or df_b.empty:
+    st.warning('Both sides need at least one request to compare.')
+    st.stop()
+
+# Traffic summary
+st.header('📊 Traffic Summary')
+
+col1, col2, col3, col4 = st.columns(4)
+
+rate_a = request_rate(df_a)
+rate_b = request_rate(df_b)
+
+with col1:
+    st.metric('요청 수 (B)', f'{len(df_b):,}', delta=f'{len(df_b) - len(df_a):+,} vs A')
+
+with col2:
+    st.metric('분당 요청 (B)', f'{rate_b:.1f}', delta=f'{rate_b - rate_a:+.1f} vs A')
+
+with col3:
+    ok_a = (df_a['status'] == 200).mean() * 100
+    ok_b = (df_b['status'] == 200).mean() * 100
+    st.metric('성공률 (B)', f'{ok_b:.1f}%', delta=f'{ok_b - ok_a:+.1f}pp vs A')
+
+with col4:
+    avg_a = df_a['rt'].mean()
+    avg_b = df_b['rt'].mean()
+    st.metric('평균 응답시간 (B)', f'{avg_b:.3f}s', delta=f'{avg_b - avg_a:+.3f}s vs A', delta_color='inverse')
+
+st.markdown('---')
+
+# Latency percentiles
+st.header('⏱️ Latency Percentiles')
+
+latency = compare_latency(df_a, df_b)
+
+if latency.empty:
+    st.info('No latency data available on both sides')
+else:
+    significance = st.slider('Significance level (α)', min_value=0.001, max_value=0.1, value=0.05, step=0.001,
+                             format='%.3f')
+    latency['significant'] = latency['p_value'] < significance
+
+    fig_latency = go.Figure()
+    labels = latency['metric'] + ' ' + latency['percentile']
+    fig_latency.add_trace(go.Bar(x=labels, y=latency['A'], name='A', marker_color='#1f77b4'))
+    fig_latency.add_trace(go.Bar(x=labels, y=latency['B'], name='B', marker_color='#ff7f0e'))
+    fig_latency.update_layout(
+        title='Latency Percentiles: A vs B',
+        xaxis_title='Metric',
+        yaxis_title='Time (seconds)',
+        barmode='group',
+        height=450,
+    )
+    st.plotly_chart(fig_latency, use_container_width=True)
+
+    st.dataframe(
+        latency.style.format({
+            'A': '{:.3f}', 'B': '{:.3f}', 'delta': '{:+.3f}', 'delta_pct': '{:+.1f}%', 'p_value': '{:.2e}',
+        }),
+        use_container_width=True,
+        height=400
+    )
+    st.caption('p_value: two-sided Mann-Whitney U test on the full distribution of each metric '
+               '(large sides are uniformly sampled)')
+
+st.markdown('---')
+
+# Status class mix
+st.header('📋 Status Class Mix')
+
+mix = pd.DataFrame({'A': status_mix(df_a), 'B': status_mix(df_b)})
+mix['delta_pp'] = mix['B'] - mix['A']
+
+col1, col2 = st.columns(2)
+
+with col1:
+    fig_mix = go.Figure()
+    fig_mix.add_trace(go.Bar(x=mix.index, y=mix['A'], name='A', marker_color='#1f77b4'))
+    fig_mix.add_trace(go.Bar(x=mix.index, y=mix['B'], name='B', marker_color='#ff7f0e'))
+    fig_mix.update_layout(
+        title='Requests by Status Class (%)',
+        xaxis_title='Status Class',
+        yaxis_title='Share (%)',
+        barmode='group',
+        height=400,
+    )
+    st.plotly_chart(fig_mix, use_container_width=True)
+
+with col2:
+    st.dataframe(
+        mix.style.format({'A': '{:.2f}%', 'B': '{:.2f}%', 'delta_pp': '{:+.2f}pp'}),
+        use_container_width=True,
+    )
+
+st.markdown('---')
+
+# Per-route latency
+if lazy_section('🛣️ Per-Route Latency (rt)', key='cmp_routes'):
+    min_count = st.slider('Minimum requests per route on each side', min_value=1, max_value=500, value=20)
+    routes_a = routes_for(source_a, df_a)
+    routes_b = routes_for(source_b, df_b)
+    routes = compare_routes(df_a, df_b, routes_a, routes_b, min_count=min_count)
+
+    if routes.empty:
+        st.info('No routes with enough requests on both sides')
+    else:
+        st.dataframe(
+            routes.style.format({
+                'p50_a': '{:.3f}', 'p95_a': '{:.3f}', 'p50_b': '{:.3f}', 'p95_b': '{:.3f}',
+                'p95_delta': '{:+.3f}', 'p95_delta_pct': '{:+.1f}%',
+            }),
+            use_container_width=True,
+            height=400
+        )
+        st.caption(f'{len(routes)} routes, sorted by P95 regression (B − A)')
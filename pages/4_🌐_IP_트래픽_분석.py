@@ -0,0 +1,264 @@
+"""
+Client/Remote IP Traffic Analysis Page
+"""
+
+import streamlit as st
+import numpy as np
+import pandas as pd
+import plotly.express as px
+from datetime import datetime
+from utils import format_ip
+from ui import lazy_section
+from rollups import window_bounds
+from ip_analytics import (
+    ip_columns, address_codes, mask_prefix, format_prefix, top_talkers, hll_registers, hll_estimate,
+)
+
+st.set_page_config(
+    page_title='IP 트래픽 분석',
+    page_icon='🌐',
+    layout='wide'
+)
+
+st.title('🌐 IP 트래픽 분석')
+st.markdown('클라이언트/원격 IP별 트래픽, 지연 시간, CIDR 대역 및 고유 IP 수를 분석합니다.')
+
+# Check if data exists
+if 'log_data' not in st.session_state or st.session_state['log_data'].empty:
+    st.warning('⚠️ 데이터가 로드되지 않았습니다. 홈페이지에서 로그 파일을 업로드해주세요.')
+    st.stop()
+
+# Shared across sessions via dataset_registry; treat as read-only
+df = st.session_state['log_data']
+
+if 'timestamp' not in df.columns or df['timestamp'].isna().all():
+    st.error('❌ 타임스탬프 데이터가 없습니다.')
+    st.stop()
+
+if not ip_columns(df, 'client_ip'):
+    st.error('❌ IP 데이터가 없습니다.')
+    st.stop()
+
+st.markdown('---')
+
+# Time filter in sidebar
+with st.sidebar:
+    st.header('🕐 Time Filter')
+
+    min_time = df['timestamp'].min()
+    max_time = df['timestamp'].max()
+
+    col1, col2 = st.columns(2)
+    with col1:
+        start_date = st.date_input('Start Date', min_time.date())
+        start_time = st.time_input('Start Time', min_time.time(), step=300)  # 5 minutes = 300 seconds
+    with col2:
+        end_date = st.date_input('End Date', max_time.date())
+        end_time = st.time_input('End Time', max_time.time(), step=300)  # 5 minutes = 300 seconds
+
+    start_datetime = datetime.combine(start_date, start_time)
+    end_datetime = datetime.combine(end_date, end_time)
+
+    # Rows are sorted by timestamp, so the window is a contiguous slice
+    lo, hi = window_bounds(df, start_datetime, end_datetime)
+    df_window = df.iloc[lo:hi]
+
+    st.info(f'Showing {len(df_window)} of {len(df)} entries')
+
+    st.markdown('---')
+    st.header('⚙️ Settings')
+
+    ip_field = st.radio(
+        'IP field',
+        ['client_ip', 'remote_ip'],
+        format_func=lambda f: 'Client IP' if f == 'client_ip' else 'Remote IP',
+    )
+
+    top_n = st.slider('Number of top IPs', min_value=5, max_value=50, value=10, step=5)
+
+    v4_prefix = st.slider('IPv4 CIDR prefix', min_value=8, max_value=32, value=24, step=1)
+    v6_prefix = st.slider('IPv6 CIDR prefix', min_value=16, max_value=128, value=64, step=8)
+
+    cardinality_interval = st.selectbox(
+        'Cardinality Interval',
+        ['Minute (10min)', 'Hour', 'Day'],
+        index=1
+    )
+
+if df_window.empty:
+    st.warning('No data matches the selected time range.')
+    st.stop()
+
+codes_all, uniques_hi, uniques_lo = address_codes(df, ip_field)
+codes = codes_all[lo:hi]
+
+window_minutes = (df_window['timestamp'].max() - df_window['timestamp'].min()).total_seconds() / 60
+
+# Addresses that appear at least once in the window; the exact distinct count is free here
+present = np.flatnonzero(np.bincount(codes, minlength=len(uniques_lo)))
+
+# Summary statistics
+st.header('📊 Summary Statistics')
+
+col1, col2, col3 = st.columns(3)
+
+with col1:
+    st.metric('총 요청 수', f'{len(df_window):,}')
+
+with col2:
+    distinct_exact = len(present)
+    st.metric('고유 IP 수', f'{distinct_exact:,}')
+
+with col3:
+    st.metric('IP당 평균 요청', f'{len(df_window) / max(distinct_exact, 1):.1f}')
+
+st.markdown('---')
+
+# Top talkers
+st.header('🔝 Top Talkers')
+
+talkers = top_talkers(df_window, codes, top_n, window_minutes)
+talker_codes = talkers.index.to_numpy()
+talkers.index = [format_ip(uniques_hi[c], uniques_lo[c]) for c in talker_codes]
+talkers.index.name = 'ip'
+
+fig_talkers = px.bar(
+    talkers.reset_index(),
+    y='ip',
+    x='requests',
+    orientation='h',
+    color='rt_p95',
+    color_continuous_scale='Reds',
+    title=f'Top {len(talkers)} IPs by Request Count',
+    labels={'ip': 'IP', 'requests': 'Request Count', 'rt_p95': 'rt P95 (s)'}
+)
+
+fig_talkers.update_layout(
+    yaxis={'categoryorder': 'total ascending'},
+    height=max(400, len(talkers) * 25)
+)
+
+st.plotly_chart(fig_talkers, use_container_width=True)
+
+st.dataframe(
+    talkers,
+    use_container_width=True,
+    height=400
+)
+
+# Per-IP request rate over time
+st.markdown('---')
+if lazy_section('📈 Per-IP Request Rate', key='ip_rate'):
+    import plotly.graph_objects as go
+
+    selected_ip = st.selectbox('IP address', list(talkers.index))
+    selected_rows = codes == talker_codes[talkers.index.get_loc(selected_ip)]
+    selected = df_window.loc[selected_rows, ['timestamp', 'rt']]
+
+    per_minute = selected.groupby(selected['timestamp'].dt.floor('min')).agg(
+        requests=('rt', 'size'),
+        rt_mean=('rt', 'mean'),
+    )
+
+    fig_ip_rate = go.Figure()
+
+    fig_ip_rate.add_trace(go.Scatter(
+        x=per_minute.index,
+        y=per_minute['requests'],
+        mode='lines+markers',
+        name='Requests / min',
+        line=dict(color='#1f77b4', width=2),
+        marker=dict(size=4),
+        hovertemplate=(
+            '<b>Requests / min</b><br>'
+            'Time: %{x}<br>'
+            'Count: %{y}<br>'
+            '<extra></extra>'
+        )
+    ))
+
+    fig_ip_rate.add_trace(go.Scatter(
+        x=per_minute.index,
+        y=per_minute['rt_mean'],
+        mode='lines',
+        name='Mean rt',
+        yaxis='y2',
+        line=dict(color='#d62728', dash='dot'),
+        hovertemplate=(
+            '<b>Mean rt</b><br>'
+            'Time: %{x}<br>'
+            'Value: %{y:.3f}s<br>'
+            '<extra></extra>'
+        )
+    ))
+
+    fig_ip_rate.update_layout(
+        title=f'Requests per Minute - {selected_ip}',
+        xaxis_title='Time',
+        yaxis_title='Request Count',
+        yaxis2=dict(title='Mean rt (seconds)', overlaying='y', side='right'),
+        hovermode='x unified',
+        height=400,
+    )
+
+    st.plotly_chart(fig_ip_rate, use_container_width=True)
+
+# CIDR prefix aggregation
+st.markdown('---')
+if lazy_section(f'🧭 CIDR Prefix Aggregation (IPv4 /{v4_prefix}, IPv6 /{v6_prefix})', key='ip_cidr'):
+    # Mask each distinct address once, then map rows to prefixes through their codes
+    prefix_hi, prefix_lo = mask_prefix(uniques_hi, uniques_lo, v4_prefix, v6_prefix)
+    prefix_of_address, prefix_uniques = pd.factorize(pd.MultiIndex.from_arrays([prefix_hi, prefix_lo]))
+    prefix_codes = prefix_of_address[codes]
+
+    distinct_per_prefix = np.bincount(prefix_of_address[present], minlength=len(prefix_uniques))
+
+    prefixes = top_talkers(df_window, prefix_codes, top_n, window_minutes)
+    prefixes.insert(1, 'distinct_ips', distinct_per_prefix[prefixes.index.to_numpy()])
+    prefixes.index = [format_prefix(*prefix_uniques[p], v4_prefix, v6_prefix) for p in prefixes.index]
+    prefixes.index.name = 'prefix'
+
+    st.dataframe(
+        prefixes,
+        use_container_width=True,
+        height=400
+    )
+
+# Distinct IPs over time
+st.markdown('---')
+if lazy_section(f'🔢 Distinct IPs Over Time ({cardinality_interval})', key='ip_cardinality'):
+    import plotly.graph_objects as go
+
+    bucket_freq = {'Minute (10min)': '10min', 'Hour': 'h', 'Day': 'D'}[cardinality_interval]
+    bucket_codes, buckets = pd.factorize(df_window['timestamp'].dt.floor(bucket_freq), sort=True)
+    registers = hll_registers(bucket_codes, len(buckets), uniques_hi[codes], uniques_lo[codes])
+    bucket_estimates = hll_estimate(registers)
+
+    fig_cardinality = go.Figure()
+
+    fig_cardinality.add_trace(go.Scatter(
+        x=buckets,
+        y=bucket_estimates,
+        mode='lines+markers',
+        name='Distinct IPs (HLL)',
+        line=dict(color='#2ca02c', width=2),
+        marker=dict(size=6),
+        hovertemplate=(
+            '<b>Distinct IPs</b><br>'
+            'Time: %{x}<br>'
+            'Estimate: %{y:,.0f}<br>'
+            '<extra></extra>'
+        )
+    ))
+
+    fig_cardinality.update_layout(
+        title='Distinct IPs per Interval (HyperLogLog estimate)',
+        xaxis_title='Time',
+        yaxis_title='Distinct IPs',
+        hovermode='x unified',
+        height=400,
+    )
+
+    st.plotly_chart(fig_cardinality, use_container_width=True)
+
+    st.caption('HyperLogLog with 1,024 registers per interval (~3% standard error)')
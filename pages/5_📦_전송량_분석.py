@@ -0,0 +1,283 @@
+"""
+Bytes / Throughput Analysis Page
+"""
+
+import streamlit as st
+import pandas as pd
+import plotly.graph_objects as go
+from datetime import datetime
+from utils import format_bytes
+from ui import lazy_section
+from bandwidth import (
+    bandwidth_rollup, transfer_rate_rollup, histogram_quantile, RATE_BIN_CENTERS, INTERVAL_SECONDS,
+)
+
+st.set_page_config(
+    page_title='전송량 분석',
+    page_icon='📦',
+    layout='wide'
+)
+
+st.title('📦 전송량 분석')
+st.markdown('시간대별·메서드별·경로별 전송량(bytes/sec)과 실효 전송 속도(bytes/rt)를 분석합니다.')
+
+# Check if data exists
+if 'log_data' not in st.session_state or st.session_state['log_data'].empty:
+    st.warning('⚠️ 데이터가 로드되지 않았습니다. 홈페이지에서 로그 파일을 업로드해주세요.')
+    st.stop()
+
+# Shared across sessions via dataset_registry; treat as read-only
+df = st.session_state['log_data']
+
+# Check if timestamp exists
+if 'timestamp' not in df.columns or df['timestamp'].isna().all():
+    st.error('❌ 타임스탬프 데이터가 없습니다.')
+    st.stop()
+
+
+st.markdown('---')
+
+# Time filter in sidebar
+with st.sidebar:
+    st.header('🕐 Time Filter')
+
+    min_time = df['timestamp'].min()
+    max_time = df['timestamp'].max()
+
+    col1, col2 = st.columns(2)
+    with col1:
+        start_date = st.date_input('Start Date', min_time.date())
+        start_time = st.time_input('Start Time', min_time.time(), step=300)  # 5 minutes = 300 seconds
+    with col2:
+        end_date = st.date_input('End Date', max_time.date())
+        end_time = st.time_input('End Time', max_time.time(), step=300)  # 5 minutes = 300 seconds
+
+    start_datetime = datetime.combine(start_date, start_time)
+    end_datetime = datetime.combine(end_date, end_time)
+
+    st.markdown('---')
+    st.header('⚙️ Settings')
+
+    time_interval = st.selectbox(
+        'Time Interval',
+        ['Minute (1min)', 'Minute (5min)', 'Minute (10min)', 'Hour'],
+        index=0
+    )
+
+    top_n = st.slider('Number of top routes', min_value=5, max_value=50, value=10, step=5)
+
+bucket_freq = {
+    'Minute (1min)': '1min',
+    'Minute (5min)': '5min',
+    'Minute (10min)': '10min',
+    'Hour': 'h',
+}[time_interval]
+bucket_seconds = INTERVAL_SECONDS[bucket_freq]
+
+# Everything below reads the per-minute rollups, never the raw rows
+start_minute = pd.Timestamp(start_datetime).floor('min')
+
+bandwidth = bandwidth_rollup(df)
+bandwidth = bandwidth[(bandwidth['timestamp'] >= start_minute) & (bandwidth['timestamp'] <= end_datetime)]
+
+rates = transfer_rate_rollup(df)
+rates = rates[(rates['timestamp'] >= start_minute) & (rates['timestamp'] <= end_datetime)]
+
+with st.sidebar:
+    st.info(f'Showing {int(bandwidth["count"].sum())} of {len(df)} entries')
+
+if bandwidth.empty:
+    st.warning('No data matches the selected time range.')
+    st.stop()
+
+bucket_bytes = bandwidth.groupby(bandwidth['timestamp'].dt.floor(bucket_freq))['bytes'].sum()
+bytes_per_sec = bucket_bytes / bucket_seconds
+
+# Summary statistics
+st.header('📊 Summary Statistics')
+
+col1, col2, col3, col4 = st.columns(4)
+
+total_bytes = bandwidth['bytes'].sum()
+span_seconds = max(
+    (bandwidth['timestamp'].max() - bandwidth['timestamp'].min()).total_seconds() + 60, 60
+)
+overall_rate = histogram_quantile(rates.groupby('bin')['count'].sum().to_frame().T, 0.5).iloc[0] \
+    if not rates.empty else float('nan')
+
+with col1:
+    st.metric('총 전송량', format_bytes(total_bytes))
+
+with col2:
+    st.metric('평균 전송량/초', f'{format_bytes(total_bytes / span_seconds)}/s')
+
+with col3:
+    st.metric(f'최대 전송량/초 ({time_interval})', f'{format_bytes(bytes_per_sec.max())}/s')
+
+with col4:
+    st.metric('실효 전송 속도 (P50)', f'{format_bytes(overall_rate)}/s' if pd.notna(overall_rate) else 'N/A')
+
+st.markdown('---')
+
+# Bandwidth over time, stacked by method
+st.header('📈 시간대별 전송량 (bytes/sec)')
+
+method_bytes = (
+    bandwidth.groupby([bandwidth['timestamp'].dt.floor(bucket_freq), 'method'])['bytes'].sum()
+    .unstack(fill_value=0)
+    / bucket_seconds
+)
+
+fig_bandwidth = go.Figure()
+
+for method in method_bytes.columns:
+    fig_bandwidth.add_trace(go.Scatter(
+        x=method_bytes.index,
+        y=method_bytes[method],
+        name=method,
+        mode='lines',
+        stackgroup='bandwidth',
+        hovertemplate=(
+            f'<b>{method}</b><br>'
+            'Time: %{x}<br>'
+            'Bytes/sec: %{y:,.0f}<br>'
+            '<extra></extra>'
+        )
+    ))
+
+fig_bandwidth.update_layout(
+    title=f'Bytes per Second by Method ({time_interval})',
+    xaxis_title='Time',
+    yaxis_title='Bytes / sec',
+    hovermode='x unified',
+    height=500,
+)
+
+st.plotly_chart(fig_bandwidth, use_container_width=True)
+
+# Per-method table
+st.subheader('📋 HTTP Method Bandwidth')
+
+per_method = bandwidth.groupby('method')[['count', 'bytes', 'rt']].sum()
+per_method['avg_bytes_per_request'] = per_method['bytes'] / per_method['count']
+per_method['bytes_per_sec'] = per_method['bytes'] / span_seconds
+method_rates = rates.pivot_table(index='method', columns='bin', values='count', aggfunc='sum', fill_value=0)
+per_method['effective_rate_p50'] = histogram_quantile(method_rates, 0.5)
+per_method['effective_rate_p5'] = histogram_quantile(method_rates, 0.05)
+per_method = per_method.drop(columns='rt').sort_values('bytes', ascending=False)
+
+st.dataframe(
+    per_method,
+    use_container_width=True,
+)
+st.caption(
+    'bytes is the response body size nginx sent ($body_bytes_sent), so request bodies are not counted: '
+    'PUT/POST rows measure the response, not upload throughput. '
+    'effective_rate: bytes / rt per request (bytes/sec), from a log-scale histogram (±0.1 decade)'
+)
+
+# Per-route bandwidth
+st.markdown('---')
+if lazy_section('🛣️ Route Bandwidth', key='bw_routes'):
+    import plotly.express as px
+
+    per_route = bandwidth.groupby('route', observed=True)[['count', 'bytes', 'rt']].sum()
+    per_route = per_route.sort_values('bytes', ascending=False).head(top_n)
+    per_route['share_%'] = per_route['bytes'] / total_bytes * 100
+    per_route['bytes_per_sec'] = per_route['bytes'] / span_seconds
+    per_route['avg_bytes_per_request'] = per_route['bytes'] / per_route['count']
+    per_route['mean_rt'] = per_route['rt'] / per_route['count']
+    per_route['aggregate_rate'] = per_route['bytes'] / per_route['rt'].where(per_route['rt'] > 0)
+    per_route = per_route.drop(columns='rt')
+    per_route.index = per_route.index.astype(str)
+
+    fig_routes = px.bar(
+        per_route.reset_index(),
+        y='route',
+        x='bytes_per_sec',
+        orientation='h',
+        title=f'Top {len(per_route)} Routes by Bytes Transferred',
+        labels={'route': 'Route', 'bytes_per_sec': 'Bytes / sec'}
+    )
+
+    fig_routes.update_layout(
+        yaxis={'categoryorder': 'total ascending'},
+        height=max(400, len(per_route) * 25)
+    )
+
+    st.plotly_chart(fig_routes, use_container_width=True)
+
+    st.dataframe(
+        per_route,
+        use_container_width=True,
+        height=400
+    )
+    st.caption('aggregate_rate: total bytes / total rt of the route (bytes/sec)')
+
+# Effective transfer rate
+st.markdown('---')
+if lazy_section('🚚 Effective Transfer Rate (bytes / rt)', key='bw_transfer_rate'):
+    if rates.empty:
+        st.info('No requests with positive bytes and rt in the selected range')
+    else:
+        method_hist = method_rates.T
+
+        fig_rate_hist = go.Figure()
+        for method in method_hist.columns:
+            fig_rate_hist.add_trace(go.Bar(
+                x=RATE_BIN_CENTERS[method_hist.index],
+                y=method_hist[method],
+                name=method,
+                hovertemplate=(
+                    f'<b>{method}</b><br>'
+                    'Rate: %{x:,.0f} B/s<br>'
+                    'Requests: %{y}<br>'
+                    '<extra></extra>'
+                )
+            ))
+
+        fig_rate_hist.update_layout(
+            title='Effective Transfer Rate Distribution',
+            xaxis_title='Bytes / sec (log scale)',
+            xaxis_type='log',
+            yaxis_title='Request Count',
+            barmode='overlay',
+            height=450,
+        )
+        fig_rate_hist.update_traces(opacity=0.7)
+
+        st.plotly_chart(fig_rate_hist, use_container_width=True)
+        st.caption('Rates use the response body size; for PUT/POST they do not reflect upload speed.')
+
+        # P50 / P5 transfer rate per bucket: the slow tail shows degradation first
+        bucket_hist = rates.pivot_table(
+            index=rates['timestamp'].dt.floor(bucket_freq), columns='bin', values='count',
+            aggfunc='sum', fill_value=0
+        )
+
+        fig_rate_time = go.Figure()
+        for q, label, color in [(0.5, 'P50', '#1f77b4'), (0.05, 'P5 (slowest)', '#d62728')]:
+            fig_rate_time.add_trace(go.Scatter(
+                x=bucket_hist.index,
+                y=histogram_quantile(bucket_hist, q),
+                name=label,
+                mode='lines+markers',
+                line=dict(color=color),
+                hovertemplate=(
+                    f'<b>{label}</b><br>'
+                    'Time: %{x}<br>'
+                    'Rate: %{y:,.0f} B/s<br>'
+                    '<extra></extra>'
+                )
+            ))
+
+        fig_rate_time.update_layout(
+            title=f'Effective Transfer Rate Over Time ({time_interval})',
+            xaxis_title='Time',
+            yaxis_title='Bytes / sec (log scale)',
+            yaxis_type='log',
+            hovermode='x unified',
+            height=450,
+        )
+
+        st.plotly_chart(fig_rate_time, use_container_width=True)
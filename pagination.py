@@ -0,0 +1,74 @@
+"""
+Server-side sorting and pagination for the request details table
+"""
+
+import numpy as np
+import pandas as pd
+from rollups import cached_rollup
+
+
+# Pages ending within the first TOP_K_LIMIT rows are served by argpartition;
+# deeper pages use a full sort permutation built once per dataset.
+TOP_K_LIMIT = 10_000
+
+SORT_OPTIONS = {
+    'Time (oldest first)': ('timestamp', False),
+    'Time (newest first)': ('timestamp', True),
+    'Slowest rt first': ('rt', True),
+    'Fastest rt first': ('rt', False),
+    'Slowest urt first': ('urt', True),
+    'Largest bytes first': ('bytes', True),
+}
+
+
+def _sort_keys(values: np.ndarray, descending: bool) -> np.ndarray:
+    # Ascending keys with missing values pushed to the end in both directions
+    keys = -values if descending else values
+    return np.where(np.isnan(keys), np.inf, keys)
+
+
+def sort_permutation(df: pd.DataFrame, column: str, descending: bool) -> np.ndarray:
+    """Row positions of the whole dataset ordered by `column`, cached per dataset."""
+
+    def compute(df):
+        keys = _sort_keys(df[column].to_numpy(dtype=float), descending)
+        return np.argsort(keys, kind='stable')
+
+    name = f'sort_{column}_{"desc" if descending else "asc"}'
+    return cached_rollup(df, name, compute)
+
+
+def page_positions(df: pd.DataFrame, positions: np.ndarray, column: str, descending: bool,
+                   start: int, stop: int) -> np.ndarray:
+    """Positions in `df` of rows [start, stop) of the matching rows sorted by `column`.
+
+    `positions` are the matching rows' positions in `df`, in dataset order. The
+    dataset is already sorted by timestamp, so time ordering needs no sort.
+    """
+    if column == 'timestamp':
+        ordered = positions[::-1] if descending else positions
+        return ordered[start:stop]
+
+    if stop <= 0:
+        return positions[:0]
+
+    if stop <= TOP_K_LIMIT:
+        keys = _sort_keys(df[column].to_numpy()[positions].astype(float), descending)
+        stop = min(stop, len(keys))
+        if start >= stop:
+            return positions[:0]
+
+        # Keep every row tied with the stop-th key, then break ties by position
+        # exactly like the stable sort_permutation, so pages never overlap
+        kth = np.partition(keys, stop - 1)[stop - 1]
+        candidates = np.flatnonzero(keys <= kth)
+        candidates = candidates[np.lexsort((positions[candidates], keys[candidates]))]
+        return positions[candidates[start:stop]]
+
+    perm = sort_permutation(df, column, descending)
+    if len(positions) == len(df):
+        return perm[start:stop]
+
+    mask = np.zeros(len(df), dtype=bool)
+    mask[positions] = True
+    return perm[mask[perm]][start:stop]
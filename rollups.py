@@ -0,0 +1,124 @@
+"""
+Pre-aggregated per-time-bucket rollups over the shared log dataset
+"""
+
+import threading
+import weakref
+import numpy as np
+import pandas as pd
+from utils import normalize_route, TIMING_COLUMNS
+
+
+PERCENTILES = [0.5, 0.95, 0.99]
+
+# (id(df), rollup name) -> aggregated frame. Datasets are immutable and shared
+# across sessions, so each rollup is computed once per dataset and dropped
+# when the dataset itself is garbage collected.
+_cache = {}
+_tracked = set()
+_lock = threading.Lock()
+
+
+def _evict(df_id: int):
+    with _lock:
+        _tracked.discard(df_id)
+        for key in [key for key in _cache if key[0] == df_id]:
+            del _cache[key]
+
+
+def cached_rollup(df: pd.DataFrame, name: str, compute):
+    """Return `compute(df)`, computed at most once per dataset."""
+    key = (id(df), name)
+    with _lock:
+        result = _cache.get(key)
+    if result is not None:
+        return result
+
+    result = compute(df)
+
+    with _lock:
+        if id(df) not in _tracked:
+            _tracked.add(id(df))
+            weakref.finalize(df, _evict, id(df))
+        _cache[key] = result
+    return result
+
+
+def slice_buckets(rollup: pd.DataFrame, start, end) -> pd.DataFrame:
+    """Restrict a rollup indexed by bucket timestamp to [start, end]."""
+    return rollup.loc[(rollup.index >= start) & (rollup.index <= end)]
+
+
+def window_bounds(df: pd.DataFrame, start, end) -> tuple:
+    """Row range [lo, hi) with start <= timestamp <= end, via binary search on the sorted timestamps."""
+    timestamps = df['timestamp'].to_numpy()
+    lo = int(np.searchsorted(timestamps, np.datetime64(start), side='left'))
+    hi = int(np.searchsorted(timestamps, np.datetime64(end), side='right'))
+    return lo, hi
+
+
+def window_slice(df: pd.DataFrame, start, end) -> pd.DataFrame:
+    """Rows with start <= timestamp <= end, without a boolean mask over the whole frame."""
+    lo, hi = window_bounds(df, start, end)
+    return df.iloc[lo:hi]
+
+
+def _minute_rollup(df: pd.DataFrame) -> pd.DataFrame:
+    grouped = df.groupby(df['timestamp'].dt.floor('min'))
+    out = grouped.size().to_frame('count')
+
+    for metric in TIMING_COLUMNS:
+        if metric in df.columns:
+            quantiles = grouped[metric].quantile(PERCENTILES).unstack()
+            for q in PERCENTILES:
+                out[f'{metric}_p{int(q * 100)}'] = quantiles[q]
+
+    out.index.name = 'timestamp'
+    return out
+
+
+def minute_rollup(df: pd.DataFrame) -> pd.DataFrame:
+    """Per-minute request count and rt/uct/uht/urt P50/P95/P99."""
+    return cached_rollup(df, 'minute', _minute_rollup)
+
+
+def _route_column(df: pd.DataFrame) -> pd.Series:
+    # Normalize each distinct path once, then map rows to templates through the codes
+    path_codes, paths = pd.factorize(df['path'])
+    template_codes, templates = pd.factorize(pd.Index(paths).map(normalize_route))
+
+    codes = np.where(path_codes >= 0, np.asarray(template_codes)[path_codes], -1)
+    routes = pd.Categorical.from_codes(codes, categories=templates)
+    return pd.Series(routes, index=df.index, name='route')
+
+
+def route_column(df: pd.DataFrame) -> pd.Series:
+    """Normalized route template for every row, as a categorical."""
+    return cached_rollup(df, 'route', _route_column)
+
+
+# Additive components of rt, in request order
+BREAKDOWN_COMPONENTS = ['uct', 'upstream_header', 'upstream_body', 'nginx_overhead']
+
+
+def _breakdown_rollup(df: pd.DataFrame) -> pd.DataFrame:
+    # Only rows with every component present; small negatives from rounding are clipped
+    parts = df[BREAKDOWN_COMPONENTS].clip(lower=0)
+    complete = parts.notna().all(axis=1)
+    parts = parts[complete]
+
+    keys = [
+        route_column(df)[complete],
+        df.loc[complete, 'timestamp'].dt.floor('min'),
+    ]
+    grouped = parts.groupby(keys, observed=True)
+
+    out = grouped.sum()
+    out['count'] = grouped.size()
+    out['urt'] = df.loc[complete, 'urt'].groupby(keys, observed=True).sum()
+    return out.reset_index()
+
+
+def breakdown_rollup(df: pd.DataFrame) -> pd.DataFrame:
+    """Per (route, minute) sums of each rt component, plus request count and urt sum."""
+    return cached_rollup(df, 'breakdown', _breakdown_rollup)
@@ -0,0 +1,34 @@
+import numpy as np
+import pandas as pd
+
+from anomaly import detect_anomalies
+
+
+def minutes(values):
+    return pd.Series(values, index=pd.date_range('2026-01-19', periods=len(values), freq='min'), dtype=float)
+
+
+def test_sparse_counts_are_not_flagged():
+    # ~0.5 req/min: the rolling median is 0 for the whole series
+    counts = minutes([0, 0, 1, 0, 0, 0, 2, 0, 1, 0] * 30)
+    assert not detect_anomalies(counts, direction='both', counts=True).any()
+
+
+def test_flat_counts_tolerate_poisson_noise():
+    counts = minutes([100] * 60 + [115] + [100] * 20 + [86] + [100] * 20)
+    assert not detect_anomalies(counts, direction='both', counts=True).any()
+
+
+def test_flat_latency_is_not_flagged():
+    p95 = minutes(0.2 + 0.0005 * np.tile([1, -1, 0, 1, 0], 40))
+    assert not detect_anomalies(p95).any()
+
+
+def test_spikes_are_still_flagged():
+    counts = minutes([0, 0, 1, 0, 0, 0, 2, 0, 1, 0] * 6 + [40] + [0] * 10)
+    flags = detect_anomalies(counts, direction='both', counts=True)
+    assert flags.sum() == 1 and flags.iloc[60]
+
+    p95 = minutes([0.2] * 60 + [2.0] + [0.2] * 10)
+    flags = detect_anomalies(p95)
+    assert flags.sum() == 1 and flags.iloc[60]
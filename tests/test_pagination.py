@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from pagination import TOP_K_LIMIT, page_positions, sort_permutation
+
+
+@pytest.fixture
+def tied_df():
+    rng = np.random.default_rng(0)
+    n = 3 * TOP_K_LIMIT
+    rt = np.round(rng.exponential(0.05, n), 3)
+    rt[rng.choice(n, 50, replace=False)] = np.nan
+    return pd.DataFrame({
+        'timestamp': pd.date_range('2026-01-19', periods=n, freq='s'),
+        'rt': rt,
+        'bytes': rng.integers(0, 5, n),
+    })
+
+
+@pytest.mark.parametrize('column,descending', [('rt', True), ('rt', False), ('bytes', True)])
+def test_pages_over_tied_keys_have_no_duplicates(tied_df, column, descending):
+    positions = np.arange(len(tied_df))
+    page_size = 100
+    n_pages = len(tied_df) // page_size
+
+    pages = [
+        page_positions(tied_df, positions, column, descending, i * page_size, (i + 1) * page_size)
+        for i in range(n_pages)
+    ]
+    served = np.concatenate(pages)
+
+    assert len(np.unique(served)) == len(served) == len(tied_df)
+    # Both the top-k and the full-permutation paths follow one order
+    np.testing.assert_array_equal(served, sort_permutation(tied_df, column, descending))
+
+
+def test_filtered_positions_page_in_sort_order(tied_df):
+    positions = np.flatnonzero(tied_df['bytes'].to_numpy() > 1)
+
+    served = np.concatenate([
+        page_positions(tied_df, positions, 'rt', True, start, start + 250)
+        for start in range(0, len(positions), 250)
+    ])
+
+    perm = sort_permutation(tied_df, 'rt', True)
+    np.testing.assert_array_equal(served, perm[np.isin(perm, positions)])
+
+
+def test_page_past_the_end_is_empty(tied_df):
+    positions = np.arange(10)
+    assert len(page_positions(tied_df, positions, 'rt', True, 20, 30)) == 0
+    assert len(page_positions(tied_df, positions, 'rt', True, 5, 30)) == 5
@@ -0,0 +1,15 @@
+"""
+Shared Streamlit UI helpers for the dashboard pages
+"""
+
+import streamlit as st
+
+
+def lazy_section(title: str, key: str, default: bool = False) -> bool:
+    """Section header with a show/hide toggle.
+
+    Pages build a section's data and figures only when this returns True, so
+    sections nobody opened cost nothing on a rerun.
+    """
+    st.header(title)
+    return st.toggle('Show section', value=default, key=f'show_{key}')
@@ -3,77 +3,304 @@ Shared utility functions for access log analysis
 """
 
 import re
+import ipaddress
+import numpy as np
 import pandas as pd
 from datetime import datetime
 
 
+# Pattern to match the log format (supports both "- -" and "- - -" formats)
+# Example 1: 192.168.125.10 - - 180.210.85.207 [19/Jan/2026:10:57:33 +0900] "PUT /path HTTP/1.1" 200 25 "-" "user-agent" "-" rt=0.541 uct=0.008 uht=0.541 urt=0.541 ua="..." us="200"
+# Example 2: 192.168.125.10 - - - 180.210.85.207 [19/Jan/2026:10:57:33 +0900] "PUT /path HTTP/1.1" 200 25 "-" "user-agent" "-" rt=0.541 uct=0.008 uht=0.541 urt=0.541 ua="..." us="200"
+LOG_PATTERN = re.compile(r'''
+    ^(\S+)\s+                           # client_ip
+    (?:\S+\s+)+                          # - - or - - - (one or more dash fields)
+    (\S+)\s+                             # remote_ip
+    \[([^\]]+)\]\s+                      # timestamp
+    "(\S+)\s+(\S+)\s+[^"]+"\s+           # method, path
+    (\d+)\s+                             # status
+    (\d+)\s+                             # bytes
+    "[^"]*"\s+                           # referer
+    "[^"]*"\s+                           # user_agent
+    "[^"]*"\s+                           # extra
+    rt=(\S+)\s+                          # rt (response time)
+    uct=(\S+)\s+                         # uct (upstream connect time)
+    uht=(\S+)\s+                         # uht (upstream header time)
+    urt=(\S+)                            # urt (upstream response time)
+''', re.VERBOSE)
+
+
+def _parse_float(val):
+    """Parse numeric values, handle '-' as None."""
+    try:
+        return float(val) if val != '-' else None
+    except ValueError:
+        return None
+
+
+def parse_log_line(line: str):
+    """Parse a single access log line into a record dict, or None if it does not match."""
+    match = LOG_PATTERN.match(line)
+    if not match:
+        return None
+
+    groups = match.groups()
+
+    # Parse timestamp: 19/Jan/2026:10:57:33 +0900
+    timestamp_str = groups[2]
+    try:
+        # Remove timezone for parsing
+        ts_parts = timestamp_str.rsplit(' ', 1)
+        dt = datetime.strptime(ts_parts[0], '%d/%b/%Y:%H:%M:%S')
+    except ValueError:
+        dt = None
+
+    return {
+        'timestamp': dt,
+        'client_ip': groups[0],
+        'remote_ip': groups[1],
+        'method': groups[3],
+        'path': groups[4],
+        'status': int(groups[5]),
+        'bytes': int(groups[6]),
+        'rt': _parse_float(groups[7]),
+        'uct': _parse_float(groups[8]),
+        'uht': _parse_float(groups[9]),
+        'urt': _parse_float(groups[10]),
+    }
+
+
+TIMING_COLUMNS = ['rt', 'uct', 'uht', 'urt']
+
+
+def add_latency_breakdown(df: pd.DataFrame) -> pd.DataFrame:
+    """Add derived columns splitting rt into connect / header / body / nginx overhead.
+
+    rt = uct + upstream_header + upstream_body + nginx_overhead
+    """
+    if df.empty:
+        return df
+
+    df['upstream_header'] = df['uht'] - df['uct']
+    df['upstream_body'] = df['urt'] - df['uht']
+    df['nginx_overhead'] = df['rt'] - df['urt']
+    return df
+
+
+# IPv4 addresses are stored IPv4-mapped (::ffff:a.b.c.d) inside the 128-bit encoding
+IPV4_MAPPED = np.uint64(0xFFFF << 32)
+IP_COLUMNS = ['client_ip', 'remote_ip']
+
+
+def encode_ips(values: pd.Series) -> tuple:
+    """Encode textual IP addresses as (hi, lo) uint64 arrays.
+
+    For IPv4, hi is 0 and the low 32 bits of lo hold the address as a uint32.
+    Anything that does not parse as an address is encoded as :: (0, 0).
+    Each distinct address is converted once and mapped back through its code.
+    """
+    codes, uniques = pd.factorize(values)
+    uniques = pd.Series(uniques, dtype=object).astype(str)
+
+    hi = np.zeros(len(uniques), dtype=np.uint64)
+    lo = np.zeros(len(uniques), dtype=np.uint64)
+
+    is_v4 = uniques.str.fullmatch(r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}').to_numpy()
+    if is_v4.any():
+        octets = uniques[is_v4].str.split('.', expand=True).astype(np.uint64).to_numpy()
+        valid = (octets <= 255).all(axis=1)
+        v4 = (
+            (octets[:, 0] << np.uint64(24)) | (octets[:, 1] << np.uint64(16))
+            | (octets[:, 2] << np.uint64(8)) | octets[:, 3]
+        )
+        lo[np.flatnonzero(is_v4)[valid]] = IPV4_MAPPED | v4[valid]
+
+    # IPv6 (and anything unusual) goes through ipaddress; these are rare in practice
+    for idx in np.flatnonzero(~is_v4):
+        try:
+            addr = ipaddress.ip_address(uniques.iat[idx])
+        except ValueError:
+            continue
+        number = int(addr) if addr.version == 6 else (0xFFFF << 32) | int(addr)
+        hi[idx] = number >> 64
+        lo[idx] = number & 0xFFFFFFFFFFFFFFFF
+
+    # Missing values have code -1, which picks the trailing :: entry
+    hi = np.append(hi, np.uint64(0))
+    lo = np.append(lo, np.uint64(0))
+    return hi[codes], lo[codes]
+
+
+def format_ip(hi: int, lo: int) -> str:
+    """Format an encoded (hi, lo) address back to text."""
+    hi, lo = int(hi), int(lo)
+    if hi == 0 and lo >> 32 == 0xFFFF:
+        return str(ipaddress.IPv4Address(lo & 0xFFFFFFFF))
+    if hi == 0 and lo == 0:
+        return '-'
+    return str(ipaddress.IPv6Address((hi << 64) | lo))
+
+
+def encode_ip_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Replace the textual IP columns with compact integer columns.
+
+    IPv4-only fields become a single `<name>_v4` uint32 column (0 when missing);
+    a field that contains IPv6 keeps the full `<name>_hi` / `<name>_lo` uint64 pair.
+    """
+    for column in IP_COLUMNS:
+        if column in df.columns:
+            hi, lo = encode_ips(df[column])
+            if not hi.any() and ((lo == 0) | ((lo & ~np.uint64(0xFFFFFFFF)) == IPV4_MAPPED)).all():
+                df[f'{column}_v4'] = (lo & np.uint64(0xFFFFFFFF)).astype(np.uint32)
+            else:
+                df[f'{column}_hi'], df[f'{column}_lo'] = hi, lo
+            df = df.drop(columns=column)
+    return df
+
+
+def widen_ip_column(df: pd.DataFrame, column: str) -> pd.DataFrame:
+    """Convert a `<column>_v4` column to the `<column>_hi` / `<column>_lo` pair."""
+    if f'{column}_v4' not in df.columns:
+        return df
+
+    v4 = df[f'{column}_v4'].to_numpy().astype(np.uint64)
+    df = df.drop(columns=f'{column}_v4')
+    df[f'{column}_hi'] = np.zeros(len(v4), dtype=np.uint64)
+    df[f'{column}_lo'] = np.where(v4 > 0, IPV4_MAPPED | v4, np.uint64(0))
+    return df
+
+
+def concat_log_frames(frames: list) -> pd.DataFrame:
+    """Concatenate parsed batches; an IP field is widened everywhere if any batch holds IPv6."""
+    for column in IP_COLUMNS:
+        if any(f'{column}_hi' in frame.columns for frame in frames):
+            frames = [widen_ip_column(frame, column) for frame in frames]
+    return pd.concat(frames, ignore_index=True)
+
+
+def build_log_dataframe(records: list, sort: bool = True) -> pd.DataFrame:
+    """Build the log DataFrame from parsed records, sorted by timestamp."""
+    df = pd.DataFrame(records)
+
+    # A batch where every value is '-' would otherwise leave an object column
+    for column in TIMING_COLUMNS:
+        if column in df.columns:
+            df[column] = df[column].astype('float64')
+
+    df = encode_ip_columns(add_latency_breakdown(df))
+    if sort and not df.empty and 'timestamp' in df.columns:
+        df = df.sort_values('timestamp').reset_index(drop=True)
+
+    return df
+
+
 def parse_access_log(log_content: str) -> pd.DataFrame:
     """Parse access log and extract performance metrics."""
 
-    # Pattern to match the log format (supports both "- -" and "- - -" formats)
-    # Example 1: 192.168.125.10 - - 180.210.85.207 [19/Jan/2026:10:57:33 +0900] "PUT /path HTTP/1.1" 200 25 "-" "user-agent" "-" rt=0.541 uct=0.008 uht=0.541 urt=0.541 ua="..." us="200"
-    # Example 2: 192.168.125.10 - - - 180.210.85.207 [19/Jan/2026:10:57:33 +0900] "PUT /path HTTP/1.1" 200 25 "-" "user-agent" "-" rt=0.541 uct=0.008 uht=0.541 urt=0.541 ua="..." us="200"
-
-    pattern = r'''
-        ^(\S+)\s+                           # client_ip
-        (?:\S+\s+)+                          # - - or - - - (one or more dash fields)
-        (\S+)\s+                             # remote_ip
-        \[([^\]]+)\]\s+                      # timestamp
-        "(\S+)\s+(\S+)\s+[^"]+"\s+           # method, path
-        (\d+)\s+                             # status
-        (\d+)\s+                             # bytes
-        "[^"]*"\s+                           # referer
-        "[^"]*"\s+                           # user_agent
-        "[^"]*"\s+                           # extra
-        rt=(\S+)\s+                          # rt (response time)
-        uct=(\S+)\s+                         # uct (upstream connect time)
-        uht=(\S+)\s+                         # uht (upstream header time)
-        urt=(\S+)                            # urt (upstream response time)
-    '''
-
-    regex = re.compile(pattern, re.VERBOSE)
-
     records = []
     for line in log_content.strip().split('\n'):
         if not line.strip():
             continue
 
-        match = regex.match(line)
-        if match:
-            groups = match.groups()
-
-            # Parse timestamp: 19/Jan/2026:10:57:33 +0900
-            timestamp_str = groups[2]
-            try:
-                # Remove timezone for parsing
-                ts_parts = timestamp_str.rsplit(' ', 1)
-                dt = datetime.strptime(ts_parts[0], '%d/%b/%Y:%H:%M:%S')
-            except ValueError:
-                dt = None
-
-            # Parse numeric values, handle '-' as None
-            def parse_float(val):
-                try:
-                    return float(val) if val != '-' else None
-                except:
-                    return None
-
-            records.append({
-                'timestamp': dt,
-                'client_ip': groups[0],
-                'remote_ip': groups[1],
-                'method': groups[3],
-                'path': groups[4],
-                'status': int(groups[5]),
-                'bytes': int(groups[6]),
-                'rt': parse_float(groups[7]),
-                'uct': parse_float(groups[8]),
-                'uht': parse_float(groups[9]),
-                'urt': parse_float(groups[10]),
-            })
+        record = parse_log_line(line)
+        if record is not None:
+            records.append(record)
 
-    df = pd.DataFrame(records)
-    if not df.empty and 'timestamp' in df.columns:
-        df = df.sort_values('timestamp').reset_index(drop=True)
+    return build_log_dataframe(records)
 
-    return df
+
+def format_bytes(num: float) -> str:
+    """Human-readable byte count (B .. TB, 1024 steps)."""
+    for unit in ['B', 'KB', 'MB', 'GB']:
+        if abs(num) < 1024:
+            return f'{num:.1f} {unit}'
+        num /= 1024
+    return f'{num:.1f} TB'
+
+
+def log_totals(df: pd.DataFrame) -> dict:
+    """Compute mergeable running totals used by the home page overview."""
+    totals = {
+        'count': len(df),
+        'ts_min': None,
+        'ts_max': None,
+        'ok_count': None,
+        'rt_sum': None,
+        'rt_count': None,
+    }
+
+    if 'timestamp' in df.columns and df['timestamp'].notna().any():
+        totals['ts_min'] = df['timestamp'].min()
+        totals['ts_max'] = df['timestamp'].max()
+
+    if 'status' in df.columns:
+        totals['ok_count'] = int((df['status'] == 200).sum())
+
+    if 'rt' in df.columns:
+        rt = df['rt'].dropna()
+        totals['rt_sum'] = float(rt.sum())
+        totals['rt_count'] = len(rt)
+
+    return totals
+
+
+def merge_log_totals(a: dict, b: dict) -> dict:
+    """Merge two totals dicts produced by log_totals()."""
+
+    def _combine(x, y, op):
+        if x is None:
+            return y
+        if y is None:
+            return x
+        return op(x, y)
+
+    return {
+        'count': a['count'] + b['count'],
+        'ts_min': _combine(a['ts_min'], b['ts_min'], min),
+        'ts_max': _combine(a['ts_max'], b['ts_max'], max),
+        'ok_count': _combine(a['ok_count'], b['ok_count'], lambda x, y: x + y),
+        'rt_sum': _combine(a['rt_sum'], b['rt_sum'], lambda x, y: x + y),
+        'rt_count': _combine(a['rt_count'], b['rt_count'], lambda x, y: x + y),
+    }
+
+
+def overview_metrics(totals: dict) -> dict:
+    """Turn running totals into the overview values (None where not available)."""
+    count = totals['count']
+
+    hours = None
+    if totals['ts_min'] is not None and totals['ts_max'] is not None:
+        hours = (totals['ts_max'] - totals['ts_min']).total_seconds() / 3600
+
+    success_rate = None
+    if totals['ok_count'] is not None and count > 0:
+        success_rate = totals['ok_count'] / count * 100
+
+    avg_rt = None
+    if totals['rt_count']:
+        avg_rt = totals['rt_sum'] / totals['rt_count']
+
+    return {
+        'total': count,
+        'hours': hours,
+        'success_rate': success_rate,
+        'avg_rt': avg_rt,
+    }
+
+
+# Rules applied in order to collapse request paths into route templates
+ROUTE_RULES = [
+    (re.compile(r'\?.*$'), ''),                                     # query string
+    (re.compile(r'/\d+(?=/|$)'), '/{n}'),                            # numeric segments (dates, ids)
+    (re.compile(r'/[^/.]*\d[^/]*?(\.\w+)?(?=/|$)'), r'/{id}\1'),     # segments containing digits, keep extension
+]
+
+
+def normalize_route(path: str) -> str:
+    """Collapse a request path into a route template.
+
+    Example: /csap-prd-obs-cdn/2026/01/19/image001.jpg -> /csap-prd-obs-cdn/{n}/{n}/{n}/{id}.jpg
+    """
+    for pattern, replacement in ROUTE_RULES:
+        path = pattern.sub(replacement, path)
+    return path